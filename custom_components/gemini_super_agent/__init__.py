@@ -1,19 +1,224 @@
+import time
+
+_IMPORT_STARTED = time.monotonic()
+
 import logging
+from typing import Callable, Optional
 import aiohttp
+import voluptuous as vol
 import yaml
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.typing import ConfigType
 
+from .batch import async_run_batch, async_save_results
+from .const import (
+    DOMAIN, SERVICE_PROCESS_REQUEST, SERVICE_PROCESS_BATCH, SERVICE_GET_ARTIFACT,
+    SERVICE_START_PROFILING, CONF_RECORD_EVENTS, EVENT_RESPONSE, EVENT_BATCH_COMPLETED,
+    HIGH_VOLUME_EVENTS, PROFILE_MODE_DETERMINISTIC, PROFILE_MODE_SAMPLING,
+    DEFAULT_PROFILE_REQUESTS, DEFAULT_PROFILE_DURATION,
+    BATCH_MODE_CONCURRENT, BATCH_MODE_API, DEFAULT_BATCH_CONCURRENCY,
+    MAX_BATCH_CONCURRENCY, DEFAULT_BATCH_TIMEOUT
+)
+from .gemini_agent import GeminiAgent
+from .profiler import ProfileSession
+from .websocket import async_register_websocket_commands
+
 _LOGGER = logging.getLogger(__name__)
 
-DOMAIN = "gemini_super_agent"
+# Time spent importing the integration and its modules
+IMPORT_TIME = time.monotonic() - _IMPORT_STARTED
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROCESS_BATCH_SCHEMA = vol.Schema({
+    vol.Required("prompts"): vol.All(cv.ensure_list, [cv.string], vol.Length(min=1)),
+    vol.Optional("concurrency", default=DEFAULT_BATCH_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_BATCH_CONCURRENCY)
+    ),
+    vol.Optional("mode", default=BATCH_MODE_CONCURRENT): vol.In(
+        [BATCH_MODE_CONCURRENT, BATCH_MODE_API]
+    ),
+    vol.Optional("timeout", default=DEFAULT_BATCH_TIMEOUT): vol.All(
+        vol.Coerce(float), vol.Range(min=1)
+    ),
+    vol.Optional("save_results", default=False): cv.boolean,
+})
+
+START_PROFILING_SCHEMA = vol.Schema({
+    vol.Optional("mode", default=PROFILE_MODE_SAMPLING): vol.In(
+        [PROFILE_MODE_DETERMINISTIC, PROFILE_MODE_SAMPLING]
+    ),
+    vol.Optional("requests", default=DEFAULT_PROFILE_REQUESTS): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+    vol.Optional("duration", default=DEFAULT_PROFILE_DURATION): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=3600)
+    ),
+})
+
 # Updated to use the latest and best model as suggested.
 GEMINI_API_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key="
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Gemini Super Agent component."""
+    async_register_websocket_commands(hass)
+    return True
+
+@callback
+def async_exclude_events_from_recorder(hass: HomeAssistant) -> Optional[Callable[[], None]]:
+    """Keep the integration's high-volume events out of the recorder.
+
+    Returns a callback that records the excluded event types again.
+    """
+    if "recorder" not in hass.config.components:
+        return None
+    from homeassistant.components.recorder import get_instance
+    
+    instance = get_instance(hass)
+    excluded = getattr(instance, "exclude_event_types", None)
+    if excluded is None:
+        _LOGGER.debug("Recorder does not support excluding event types")
+        return None
+    # Types the user already excluded stay excluded after unload
+    added = HIGH_VOLUME_EVENTS - set(excluded)
+    instance.exclude_event_types = set(excluded) | added
+    
+    @callback
+    def async_restore() -> None:
+        instance.exclude_event_types = set(instance.exclude_event_types) - added
+    
+    return async_restore
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Gemini Super Agent from a config entry."""
+    started = time.monotonic()
+    hass.data.setdefault(DOMAIN, {})
+    
+    agent = GeminiAgent(hass, entry.data)
+    hass.data[DOMAIN][entry.entry_id] = agent
+    agent.timings["import"] = IMPORT_TIME
+    
+    # Loading the SDK and warming the caches must not hold up startup;
+    # requests wait for the agent to become ready.
+    entry.async_create_background_task(
+        hass, agent.async_start(), f"{DOMAIN} warm-up"
+    )
+    
+    if not entry.data.get(CONF_RECORD_EVENTS):
+        restore_recorder = async_exclude_events_from_recorder(hass)
+        if restore_recorder:
+            entry.async_on_unload(restore_recorder)
+    
+    async def async_process_request(call: ServiceCall) -> ServiceResponse:
+        """Process a natural language request."""
+        user_input = call.data.get("text", "")
+        conversation_id = call.data.get("conversation_id", "default")
+        response = await agent.process_request(user_input, conversation_id)
+        
+        hass.bus.async_fire(
+            EVENT_RESPONSE,
+            {
+                "conversation_id": conversation_id,
+                "content_hash": agent.artifacts.put(response),
+                "length": len(response),
+            }
+        )
+        return {"response": response, "conversation_id": conversation_id}
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROCESS_REQUEST,
+        async_process_request,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    async def async_get_artifact(call: ServiceCall) -> ServiceResponse:
+        """Return the full payload behind an event's content hash."""
+        payload = agent.artifacts.get(call.data["content_hash"])
+        if payload is None:
+            raise HomeAssistantError("Unknown or expired content hash")
+        return {"content_hash": call.data["content_hash"], "payload": payload}
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ARTIFACT,
+        async_get_artifact,
+        schema=vol.Schema({vol.Required("content_hash"): cv.string}),
+        supports_response=SupportsResponse.ONLY,
+    )
+    
+    async def async_start_profiling(call: ServiceCall):
+        """Profile the agent over the next requests or seconds."""
+        if agent.profiler:
+            raise HomeAssistantError("A profiling session is already running")
+        
+        @callback
+        def profiling_done(session: ProfileSession):
+            agent.profiler = None
+            agent.last_profile = session.summary
+        
+        session = ProfileSession(
+            hass,
+            call.data["mode"],
+            call.data["requests"],
+            call.data["duration"],
+            profiling_done,
+        )
+        try:
+            session.start()
+        except ValueError as e:
+            # cProfile refuses to start while another profiler is active
+            raise HomeAssistantError(f"Could not start profiling: {e}") from e
+        agent.profiler = session
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILING,
+        async_start_profiling,
+        schema=START_PROFILING_SCHEMA,
+    )
+    
+    async def async_process_batch(call: ServiceCall) -> ServiceResponse:
+        """Run a list of prompts with bounded concurrency."""
+        result = await async_run_batch(
+            agent,
+            call.data["prompts"],
+            concurrency=call.data["concurrency"],
+            mode=call.data["mode"],
+            timeout=call.data["timeout"],
+            session=async_get_clientsession(hass),
+        )
+        
+        path = None
+        if call.data["save_results"]:
+            path = await async_save_results(hass, result)
+            result["path"] = path
+        
+        # The event carries the summary only; results are returned or saved
+        hass.bus.async_fire(
+            EVENT_BATCH_COMPLETED,
+            {
+                "batch_id": result["batch_id"],
+                "succeeded": result["succeeded"],
+                "failed": result["failed"],
+                "duration": result["duration"],
+                "path": path,
+            }
+        )
+        return result
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROCESS_BATCH,
+        async_process_batch,
+        schema=PROCESS_BATCH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
     async def handle_prompt(call: ServiceCall):
         """Handle the service call to generate content with Gemini."""
@@ -51,8 +256,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                             text_response = result['candidates'][0]['content']['parts'][0]['text']
                             _LOGGER.info(f"Gemini Response: {text_response}")
                             
-                            # You can fire an event with the response
-                            hass.bus.async_fire(f"{DOMAIN}_response", {"response_text": text_response})
+                            hass.bus.async_fire(
+                                EVENT_RESPONSE,
+                                {
+                                    "content_hash": agent.artifacts.put(text_response),
+                                    "length": len(text_response),
+                                }
+                            )
 
                         except (KeyError, IndexError) as e:
                             _LOGGER.error(f"Error parsing Gemini response: {e}")
@@ -68,6 +278,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.services.async_register(DOMAIN, "prompt", handle_prompt)
     _LOGGER.info("Gemini Super Agent service is registered.")
     
+    agent.timings["setup_entry"] = time.monotonic() - started
+    
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -75,5 +287,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # This is called when the integration is removed or reloaded.
     # We remove the service that was registered.
     hass.services.async_remove(DOMAIN, "prompt")
+    hass.services.async_remove(DOMAIN, SERVICE_PROCESS_REQUEST)
+    hass.services.async_remove(DOMAIN, SERVICE_PROCESS_BATCH)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_ARTIFACT)
+    hass.services.async_remove(DOMAIN, SERVICE_START_PROFILING)
+    agent = hass.data[DOMAIN].pop(entry.entry_id)
+    await agent.async_shutdown()
     _LOGGER.info("Gemini Super Agent service unregistered.")
     return True
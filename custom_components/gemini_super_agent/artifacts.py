@@ -0,0 +1,38 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Optional
+from .const import MAX_ARTIFACTS
+
+def content_hash(payload: Any) -> str:
+    """Return a short, stable hash of a JSON-serializable payload."""
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+class ArtifactStore:
+    """Keep recent full payloads so events only need to carry their hash.
+
+    The integration's events carry IDs, counts and a content hash instead of
+    the full response, automation or scene config. Listeners fetch the
+    payload through the get_artifact service or websocket command.
+    """
+
+    def __init__(self, max_items: int = MAX_ARTIFACTS):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, payload: Any) -> str:
+        """Store a payload and return its content hash."""
+        key = content_hash(payload)
+        self._items[key] = payload
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a stored payload, or None if it has been evicted."""
+        return self._items.get(key)
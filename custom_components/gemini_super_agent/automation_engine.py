@@ -38,10 +38,15 @@ async def create_automation(
         # Create automation
         await automation.async_create(validated_config[automation.DOMAIN])
         
-        # Fire event
         hass.bus.async_fire(
             EVENT_AUTOMATION_CREATED,
-            {"name": name, "config": automation_config}
+            {
+                "name": name,
+                "content_hash": agent.artifacts.put(automation_config),
+                "trigger_count": len(triggers),
+                "condition_count": len(conditions or []),
+                "action_count": len(actions),
+            }
         )
         
         return f"Automation '{name}' created successfully!"
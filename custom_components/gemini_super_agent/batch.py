@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+import aiohttp
+from homeassistant.util import dt as dt_util
+from .const import (
+    BATCH_MODE_API, BATCH_MODE_CONCURRENT, BATCH_POLL_INTERVAL,
+    DEFAULT_BATCH_CONCURRENCY, DEFAULT_BATCH_TIMEOUT, GEMINI_API_BASE
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_run_batch(
+    agent: Any,
+    prompts: List[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    mode: str = BATCH_MODE_CONCURRENT,
+    timeout: float = DEFAULT_BATCH_TIMEOUT,
+    session: Optional[aiohttp.ClientSession] = None,
+    base_url: str = GEMINI_API_BASE
+) -> Dict[str, Any]:
+    """Run a list of prompts and return every result with status and timing.
+
+    The default mode sends each prompt through the agent with at most
+    `concurrency` requests in flight. The batch API mode submits all prompts
+    as one Gemini batch job; those prompts get the house description and
+    current states but cannot call functions.
+    """
+    batch_id = uuid.uuid4().hex[:12]
+    started_at = dt_util.utcnow().isoformat()
+    started = time.monotonic()
+    
+    if mode == BATCH_MODE_API:
+        await agent.async_wait_ready()
+        client = BatchApiClient(session, agent.api_key, agent.model_name, base_url)
+        items = await client.async_run(
+            prompts, agent.system_instruction, agent.describe_states(), timeout
+        )
+    else:
+        items = await _async_run_concurrent(agent, batch_id, prompts, concurrency, timeout)
+    
+    return {
+        "batch_id": batch_id,
+        "mode": mode,
+        "started": started_at,
+        "duration": round(time.monotonic() - started, 3),
+        "succeeded": sum(1 for item in items if item["status"] == "ok"),
+        "failed": sum(1 for item in items if item["status"] != "ok"),
+        "items": items,
+    }
+
+async def _async_run_concurrent(
+    agent: Any,
+    batch_id: str,
+    prompts: List[str],
+    concurrency: int,
+    timeout: float
+) -> List[Dict[str, Any]]:
+    """Run prompts through the agent with bounded concurrency."""
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    
+    async def run(index: int, prompt: str) -> Dict[str, Any]:
+        item = {"index": index, "prompt": prompt}
+        # Each prompt is independent, so it gets a throwaway conversation
+        conversation_id = f"batch_{batch_id}_{index}"
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                item["response"] = await asyncio.wait_for(
+                    agent.process_request(prompt, conversation_id), timeout
+                )
+                item["status"] = "ok"
+            except asyncio.TimeoutError:
+                item["status"] = "timeout"
+            except Exception as e:
+                _LOGGER.error(f"Error in batch item {index}: {str(e)}")
+                item["status"] = "error"
+                item["error"] = str(e)
+            finally:
+                agent.discard_conversation(conversation_id)
+            item["duration"] = round(time.monotonic() - started, 3)
+        return item
+    
+    return list(await asyncio.gather(*(run(i, p) for i, p in enumerate(prompts))))
+
+class BatchApiClient:
+    """Minimal client for the Gemini batch generation REST API.
+
+    `base_url` can point at a local stub implementing the same two calls:
+    `POST {base}/models/{model}:batchGenerateContent` returning an operation
+    with a `name`, and `GET {base}/{name}` returning it with `done` set and
+    the inlined responses once the job has finished.
+    """
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        api_key: str,
+        model: str,
+        base_url: str = GEMINI_API_BASE,
+        poll_interval: float = BATCH_POLL_INTERVAL
+    ):
+        self.session = session
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.poll_interval = poll_interval
+
+    async def async_run(
+        self,
+        prompts: List[str],
+        system_instruction: str,
+        state_context: str,
+        timeout: float
+    ) -> List[Dict[str, Any]]:
+        """Submit the prompts as one job and wait for the results."""
+        items = [{"index": i, "prompt": p, "status": "pending"} for i, p in enumerate(prompts)]
+        requests = [
+            {
+                "request": {
+                    "system_instruction": {"parts": [{"text": system_instruction}]},
+                    "contents": [{
+                        "role": "user",
+                        "parts": [{"text": f"{state_context}\n\nUser request: {prompt}"}],
+                    }],
+                },
+                "metadata": {"key": str(index)},
+            }
+            for index, prompt in enumerate(prompts)
+        ]
+        payload = {
+            "batch": {
+                "display_name": "gemini_super_agent",
+                "input_config": {"requests": {"requests": requests}},
+            }
+        }
+        
+        started = time.monotonic()
+        try:
+            operation = await self._async_request(
+                "post", f"{self.base_url}/models/{self.model}:batchGenerateContent", payload
+            )
+            name = operation["name"]
+            while not operation.get("done"):
+                if time.monotonic() - started > timeout:
+                    _LOGGER.warning(f"Batch job {name} did not finish in {timeout}s")
+                    for item in items:
+                        item["status"] = "timeout"
+                        item["job"] = name
+                    return items
+                await asyncio.sleep(self.poll_interval)
+                operation = await self._async_request("get", f"{self.base_url}/{name}")
+        except (aiohttp.ClientError, KeyError, ValueError) as e:
+            _LOGGER.error(f"Error running batch job: {str(e)}")
+            for item in items:
+                item["status"] = "error"
+                item["error"] = str(e)
+            return items
+        
+        duration = round(time.monotonic() - started, 3)
+        if "error" in operation:
+            for item in items:
+                item["status"] = "error"
+                item["error"] = operation["error"].get("message", "Batch job failed")
+                item["duration"] = duration
+            return items
+        
+        responses = (
+            operation.get("response", {})
+            .get("inlinedResponses", {})
+            .get("inlinedResponses", [])
+        )
+        for position, result in enumerate(responses):
+            key = result.get("metadata", {}).get("key", position)
+            try:
+                item = items[int(key)]
+            except (ValueError, IndexError):
+                continue
+            item["duration"] = duration
+            if "error" in result:
+                item["status"] = "error"
+                item["error"] = result["error"].get("message", "Request failed")
+                continue
+            try:
+                parts = result["response"]["candidates"][0]["content"]["parts"]
+                item["response"] = "".join(part.get("text", "") for part in parts)
+                item["status"] = "ok"
+            except (KeyError, IndexError) as e:
+                item["status"] = "error"
+                item["error"] = f"Error parsing response: {e}"
+        
+        return items
+
+    async def _async_request(self, method: str, url: str, payload: Dict[str, Any] = None) -> Dict[str, Any]:
+        headers = {"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+        async with self.session.request(method, url, headers=headers, json=payload) as response:
+            if response.status != 200:
+                raise ValueError(f"{response.status} - {await response.text()}")
+            return await response.json()
+
+async def async_save_results(hass: Any, result: Dict[str, Any]) -> str:
+    """Write batch results to the config directory and return the path."""
+    path = hass.config.path(f"gemini_super_agent_batch_{result['batch_id']}.json")
+    
+    def write():
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+    
+    await hass.async_add_executor_job(write)
+    return path
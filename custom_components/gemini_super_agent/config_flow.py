@@ -1,7 +1,13 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN, CONF_API_KEY, CONF_MODEL, DEFAULT_MODEL
+from .const import (
+    DOMAIN, CONF_API_KEY, CONF_MODEL, CONF_CONTEXT_CACHE, CONF_CACHE_TTL,
+    CONF_MODEL_ROUTING, CONF_FAST_MODEL, CONF_PRO_MODEL, CONF_RECORD_EVENTS,
+    CONF_VISION_MAX_PIXELS, CONF_VISION_MAX_BYTES,
+    DEFAULT_MODEL, DEFAULT_CACHE_TTL, DEFAULT_FAST_MODEL, DEFAULT_PRO_MODEL,
+    DEFAULT_VISION_MAX_PIXELS, DEFAULT_VISION_MAX_BYTES, MIN_CACHE_TTL
+)
 
 class GeminiSuperAgentConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -24,6 +30,20 @@ class GeminiSuperAgentConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_MODEL, default=DEFAULT_MODEL): vol.In([
                     "gemini-pro", "gemini-pro-vision"
                 ]),
+                vol.Optional(CONF_CONTEXT_CACHE, default=False): bool,
+                vol.Optional(CONF_CACHE_TTL, default=DEFAULT_CACHE_TTL): vol.All(
+                    vol.Coerce(int), vol.Range(min=MIN_CACHE_TTL)
+                ),
+                vol.Optional(CONF_MODEL_ROUTING, default=False): bool,
+                vol.Optional(CONF_FAST_MODEL, default=DEFAULT_FAST_MODEL): str,
+                vol.Optional(CONF_PRO_MODEL, default=DEFAULT_PRO_MODEL): str,
+                vol.Optional(CONF_RECORD_EVENTS, default=False): bool,
+                vol.Optional(CONF_VISION_MAX_PIXELS, default=DEFAULT_VISION_MAX_PIXELS): vol.All(
+                    vol.Coerce(int), vol.Range(min=64 * 64)
+                ),
+                vol.Optional(CONF_VISION_MAX_BYTES, default=DEFAULT_VISION_MAX_BYTES): vol.All(
+                    vol.Coerce(int), vol.Range(min=10000)
+                ),
             }),
             errors=errors,
         )
\ No newline at end of file
@@ -1,9 +1,97 @@
 DOMAIN = "gemini_super_agent"
 CONF_API_KEY = "api_key"
 CONF_MODEL = "model"
+CONF_CONTEXT_CACHE = "context_cache"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_MODEL_ROUTING = "model_routing"
+CONF_FAST_MODEL = "fast_model"
+CONF_PRO_MODEL = "pro_model"
+CONF_RECORD_EVENTS = "record_events"
+CONF_VISION_MAX_PIXELS = "vision_max_pixels"
+CONF_VISION_MAX_BYTES = "vision_max_bytes"
 DEFAULT_MODEL = "gemini-pro"
+DEFAULT_FAST_MODEL = "gemini-2.5-flash-lite"
+DEFAULT_PRO_MODEL = "gemini-2.5-pro"
+DEFAULT_CACHE_TTL = 3600
+
+# Model tiers used by the router
+TIER_FAST = "fast"
+TIER_DEFAULT = "default"
+TIER_PRO = "pro"
+
+# Extend a context cache when it is this close (seconds) to expiring
+CACHE_REFRESH_MARGIN = 300
+# Shortest context cache TTL (seconds) offered in the config flow
+MIN_CACHE_TTL = 2 * CACHE_REFRESH_MARGIN
+
+# Delay (seconds) that coalesces bursts of registry changes before the
+# system instruction is rebuilt
+REGISTRY_REFRESH_DELAY = 10
+
+# Maximum number of changed entities listed in a single turn
+MAX_STATE_DELTA = 100
+
+# Number of recently mentioned or touched entities kept per conversation;
+# their changes are listed first
+MAX_FOCUS_ENTITIES = 50
+
+# Size caps for function results sent back to the model
+MAX_RESULT_CHARS = 4000
+MAX_VALUE_CHARS = 200
+DEFAULT_PAGE_SIZE = 50
+
+# Limits for history summaries
+DEFAULT_HISTORY_HOURS = 24
+MAX_HISTORY_ENTITIES = 20
+MAX_HISTORY_POINTS = 48
+
+# Batch prompt service
+BATCH_MODE_CONCURRENT = "concurrent"
+BATCH_MODE_API = "batch_api"
+DEFAULT_BATCH_CONCURRENCY = 4
+MAX_BATCH_CONCURRENCY = 20
+DEFAULT_BATCH_TIMEOUT = 3600
+BATCH_POLL_INTERVAL = 30
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+# Fuzzy entity resolver
+RESOLVER_NGRAM = 3
+RESOLVER_CANDIDATES = 25
+RESOLVER_REWEIGHT_RATIO = 0.1
+FUZZY_MATCH_LIMIT = 20
+
+# Profiling service
+PROFILE_MODE_DETERMINISTIC = "deterministic"
+PROFILE_MODE_SAMPLING = "sampling"
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_TOP_FUNCTIONS = 30
+DEFAULT_PROFILE_REQUESTS = 10
+DEFAULT_PROFILE_DURATION = 300
+
+# Camera snapshots for vision requests
+DEFAULT_VISION_MAX_PIXELS = 640 * 480
+DEFAULT_VISION_MAX_BYTES = 150000
+SNAPSHOT_CACHE_TTL = 30
+MAX_SNAPSHOT_CAMERAS = 4
+
+# Number of full payloads kept for slim events
+MAX_ARTIFACTS = 100
+
+# Number of recently called tools kept per conversation for tool selection
+RECENT_TOOLS_LIMIT = 4
 
 SERVICE_PROCESS_REQUEST = "process_request"
+SERVICE_PROCESS_BATCH = "process_batch"
+SERVICE_GET_ARTIFACT = "get_artifact"
+SERVICE_START_PROFILING = "start_profiling"
+
+WS_TYPE_PROCESS = f"{DOMAIN}/process"
+WS_TYPE_ARTIFACT = f"{DOMAIN}/artifact"
 
+EVENT_RESPONSE = "gemini_super_agent_response"
 EVENT_AUTOMATION_CREATED = "gemini_super_agent_automation_created"
-EVENT_SCENE_CREATED = "gemini_super_agent_scene_created"
\ No newline at end of file
+EVENT_SCENE_CREATED = "gemini_super_agent_scene_created"
+EVENT_BATCH_COMPLETED = "gemini_super_agent_batch_completed"
+
+# Event types left out of the recorder unless record_events is enabled
+HIGH_VOLUME_EVENTS = {EVENT_RESPONSE}
\ No newline at end of file
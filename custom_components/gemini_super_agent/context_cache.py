@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from homeassistant.core import HomeAssistant
+from .const import CACHE_REFRESH_MARGIN, DEFAULT_CACHE_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump when the layout of the cached prefix changes
+CACHE_SCHEMA_VERSION = 1
+
+class GenaiCacheBackend:
+    """Cached-content backend using the google.generativeai SDK.
+
+    All methods are blocking and are run in the executor. Any object with the
+    same methods can be passed to ContextCacheManager instead, e.g. a local
+    stand-in of the caching endpoints.
+    """
+
+    def create(
+        self,
+        model_name: str,
+        system_instruction: str,
+        tools: List[Dict[str, Any]],
+        tool_config: Dict[str, Any],
+        ttl: int
+    ) -> Any:
+        from google.generativeai import caching
+        return caching.CachedContent.create(
+            model=model_name,
+            system_instruction=system_instruction,
+            tools=tools,
+            tool_config=tool_config,
+            ttl=timedelta(seconds=ttl),
+        )
+
+    def extend(self, cache: Any, ttl: int) -> None:
+        cache.update(ttl=timedelta(seconds=ttl))
+
+    def delete(self, cache: Any) -> None:
+        cache.delete()
+
+    def model_from_cache(self, cache: Any) -> Any:
+        import google.generativeai as genai
+        return genai.GenerativeModel.from_cached_content(cached_content=cache)
+
+@dataclass
+class CacheEntry:
+    key: str
+    cache: Any
+    model: Any
+    expires_at: float
+
+class ContextCacheManager:
+    """Keep the static prompt prefix registered as cached content.
+
+    The API rejects tools or a tool config sent alongside cached content,
+    so both are part of the cache: one cache is kept per model and function
+    calling mode, keyed by a hash of the system instruction (which holds the
+    registry snapshot), the function schemas, the mode and the cache schema
+    version. A changed key replaces the cache; a cache close to its TTL has
+    its expiry extended.
+    """
+
+    def __init__(self, hass: HomeAssistant, backend: Any = None, ttl: int = DEFAULT_CACHE_TTL):
+        self.hass = hass
+        self.backend = backend or GenaiCacheBackend()
+        self.ttl = ttl
+        # Short TTLs (from older config entries) would otherwise be extended
+        # on every request
+        self.refresh_margin = min(CACHE_REFRESH_MARGIN, ttl / 4)
+        self._entries: Dict[str, CacheEntry] = {}
+        # Concurrent misses on a slot must not each create a cache
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Keys that could not be cached, so they are not retried every request
+        self._failed: Dict[str, str] = {}
+        self.stats = {
+            "hits": 0,
+            "creates": 0,
+            "extends": 0,
+            "errors": 0,
+            "cached_requests": 0,
+            "uncached_requests": 0,
+            "cached_tokens": 0,
+            "cached_latency": 0.0,
+            "uncached_latency": 0.0,
+        }
+
+    @staticmethod
+    def tool_config(mode: str) -> Dict[str, Any]:
+        """Return the tool config cached for a function calling mode."""
+        return {"function_calling_config": mode}
+
+    @staticmethod
+    def compute_key(model_name: str, system_instruction: str, tools: List[Dict[str, Any]], mode: str) -> str:
+        """Hash everything that makes up the cached prefix."""
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_SCHEMA_VERSION}:{model_name}:{mode}\n".encode())
+        digest.update(system_instruction.encode())
+        digest.update(json.dumps(tools, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    async def async_get_model(
+        self,
+        model_name: str,
+        system_instruction: str,
+        tools: List[Dict[str, Any]],
+        mode: str
+    ) -> Optional[Any]:
+        """Return a model bound to the cached prefix, or None to run uncached.
+
+        Requests on the returned model must not pass tools or a tool config.
+        """
+        slot = f"{model_name}:{mode}"
+        key = self.compute_key(model_name, system_instruction, tools, mode)
+        async with self._locks.setdefault(slot, asyncio.Lock()):
+            return await self._async_get_slot_model(
+                slot, key, model_name, system_instruction, tools, mode
+            )
+
+    async def _async_get_slot_model(
+        self,
+        slot: str,
+        key: str,
+        model_name: str,
+        system_instruction: str,
+        tools: List[Dict[str, Any]],
+        mode: str
+    ) -> Optional[Any]:
+        entry = self._entries.get(slot)
+        now = time.monotonic()
+        
+        if entry and entry.key == key and entry.expires_at > now:
+            if entry.expires_at - now < self.refresh_margin:
+                try:
+                    await self.hass.async_add_executor_job(self.backend.extend, entry.cache, self.ttl)
+                    entry.expires_at = now + self.ttl
+                    self.stats["extends"] += 1
+                except Exception as e:
+                    _LOGGER.warning(f"Error extending context cache: {str(e)}")
+                    self.stats["errors"] += 1
+                    return await self._async_replace(slot, key, model_name, system_instruction, tools, mode)
+            self.stats["hits"] += 1
+            return entry.model
+        
+        return await self._async_replace(slot, key, model_name, system_instruction, tools, mode)
+
+    async def _async_replace(
+        self,
+        slot: str,
+        key: str,
+        model_name: str,
+        system_instruction: str,
+        tools: List[Dict[str, Any]],
+        mode: str
+    ) -> Optional[Any]:
+        """Drop the current cache in a slot and register a new one."""
+        await self._async_delete(slot)
+        if self._failed.get(slot) == key:
+            return None
+        try:
+            cache = await self.hass.async_add_executor_job(
+                self.backend.create, model_name, system_instruction, tools,
+                self.tool_config(mode), self.ttl
+            )
+            model = await self.hass.async_add_executor_job(self.backend.model_from_cache, cache)
+        except Exception as e:
+            # Prefixes below the minimum cacheable size end up here too
+            _LOGGER.warning(f"Context cache unavailable, sending uncached: {str(e)}")
+            self.stats["errors"] += 1
+            self._failed[slot] = key
+            return None
+        
+        self._failed.pop(slot, None)
+        self._entries[slot] = CacheEntry(key, cache, model, time.monotonic() + self.ttl)
+        self.stats["creates"] += 1
+        _LOGGER.debug(f"Registered context cache for {slot} ({key[:12]})")
+        return model
+
+    async def _async_delete(self, slot: str) -> None:
+        entry = self._entries.pop(slot, None)
+        if not entry:
+            return
+        try:
+            await self.hass.async_add_executor_job(self.backend.delete, entry.cache)
+        except Exception as e:
+            # The cache may already have expired server side
+            _LOGGER.debug(f"Error deleting context cache: {str(e)}")
+
+    async def async_clear(self) -> None:
+        """Delete every registered cache."""
+        for slot in list(self._entries):
+            await self._async_delete(slot)
+
+    def record_usage(self, response: Any, latency: float, cached: bool) -> None:
+        """Record token and latency savings for one request."""
+        if not cached:
+            self.stats["uncached_requests"] += 1
+            self.stats["uncached_latency"] += latency
+            return
+        
+        usage = getattr(response, "usage_metadata", None)
+        cached_tokens = getattr(usage, "cached_content_token_count", 0) or 0
+        self.stats["cached_requests"] += 1
+        self.stats["cached_latency"] += latency
+        self.stats["cached_tokens"] += cached_tokens
+        
+        if self.stats["uncached_requests"]:
+            baseline = self.stats["uncached_latency"] / self.stats["uncached_requests"]
+            _LOGGER.debug(
+                f"Context cache saved {cached_tokens} input tokens, "
+                f"latency {latency * 1000:.0f} ms vs {baseline * 1000:.0f} ms uncached"
+            )
+        else:
+            _LOGGER.debug(f"Context cache saved {cached_tokens} input tokens")
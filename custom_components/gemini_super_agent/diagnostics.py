@@ -0,0 +1,28 @@
+from typing import Any, Dict
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import CONF_API_KEY, DOMAIN
+
+TO_REDACT = {CONF_API_KEY}
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    agent = hass.data[DOMAIN][entry.entry_id]
+    diagnostics = {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "ready": agent.ready,
+        "timings": {key: round(value, 4) for key, value in agent.timings.items()},
+        "entities": len(agent.entities),
+        "devices": len(agent.devices),
+        "areas": len(agent.areas),
+        "conversations": len(agent.chat_sessions),
+        "model_tiers": agent.router.report(),
+        "profiling_active": agent.profiler is not None,
+        "last_profile": agent.last_profile,
+    }
+    if agent.context_cache:
+        diagnostics["context_cache"] = agent.context_cache.stats
+    return diagnostics
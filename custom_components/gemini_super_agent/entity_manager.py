@@ -6,7 +6,11 @@ from homeassistant.const import (
     SERVICE_TOGGLE, ATTR_DOMAIN
 )
 from homeassistant.helpers import entity_registry as er
-from .const import EVENT_SCENE_CREATED
+from .const import DEFAULT_PAGE_SIZE, EVENT_SCENE_CREATED, FUZZY_MATCH_LIMIT
+from .result_utils import compact_value, paginate
+
+# Attributes returned by get_entity_state when none are requested
+DEFAULT_ATTRIBUTES = ["friendly_name", "unit_of_measurement", "device_class"]
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,70 +19,152 @@ async def find_entities(
     name: str = None,
     domain: str = None,
     area: str = None,
-    device: str = None
-) -> str:
-    """Find entities based on criteria."""
+    device: str = None,
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Dict[str, Any]:
+    """Find entities based on criteria, one page at a time."""
     hass = agent.hass
     matches = []
     
     for entity_id, entity in agent.entities.items():
         # Check name match
-        if name and name.lower() not in entity.get("name", "").lower():
+        if name and name.lower() not in (entity.get("name") or "").lower():
             continue
         
-        # Check domain match
-        if domain and entity.get("domain") != domain:
+        if not _matches_filters(agent, entity, domain, area, device):
             continue
         
-        # Check area match
-        if area:
-            area_id = entity.get("area_id")
-            if area_id:
-                area_info = agent.areas.get(area_id, {})
-                if area.lower() not in area_info.get("name", "").lower():
-                    continue
-            else:
-                continue
-        
-        # Check device match
-        if device:
-            device_id = entity.get("device_id")
-            if device_id:
-                device_info = agent.devices.get(device_id, {})
-                if device.lower() not in device_info.get("name", "").lower():
-                    continue
-            else:
-                continue
-        
-        matches.append(f"{entity_id}: {entity.get('name', 'Unnamed')}")
+        matches.append({"entity_id": entity_id, "name": entity.get("name")})
     
-    if not matches:
-        return "No entities found matching your criteria."
+    # Fall back to fuzzy matching when the name matched nothing literally
+    if name and not matches:
+        for entity_id, score in agent.resolver.search(name, limit=FUZZY_MATCH_LIMIT):
+            entity = agent.entities.get(entity_id)
+            if entity and _matches_filters(agent, entity, domain, area, device):
+                matches.append({"entity_id": entity_id, "name": entity.get("name"), "score": score})
     
-    result = f"Found {len(matches)} matching entities:\n"
-    for i, match in enumerate(matches, 1):
-        result += f"{i}. {match}\n"
+    query = {"name": name, "domain": domain, "area": area, "device": device}
+    return paginate(matches, "entities", query, cursor, int(limit))
+
+def _matches_filters(
+    agent: Any,
+    entity: Dict[str, Any],
+    domain: str = None,
+    area: str = None,
+    device: str = None
+) -> bool:
+    """Check an entity against the domain, area and device filters."""
+    # Check domain match
+    if domain and entity.get("domain") != domain:
+        return False
     
-    return result
+    # Check area match
+    if area:
+        area_id = entity.get("area_id")
+        if not area_id:
+            return False
+        area_info = agent.areas.get(area_id, {})
+        if area.lower() not in (area_info.get("name") or "").lower():
+            return False
+    
+    # Check device match
+    if device:
+        device_id = entity.get("device_id")
+        if not device_id:
+            return False
+        device_info = agent.devices.get(device_id, {})
+        if device.lower() not in (device_info.get("name") or "").lower():
+            return False
+    
+    return True
 
-async def get_entity_state(agent: Any, entity_id: str) -> str:
-    """Get the current state of an entity."""
+async def get_entity_state(
+    agent: Any,
+    entity_id: str,
+    attributes: List[str] = None
+) -> Dict[str, Any]:
+    """Get the current state of an entity with the requested attributes."""
     hass = agent.hass
     state_obj = hass.states.get(entity_id)
     
     if not state_obj:
-        return f"Entity {entity_id} not found."
+        return {"error": f"Entity {entity_id} not found."}
     
-    result = f"Entity: {entity_id}\n"
-    result += f"State: {state_obj.state}\n"
+    result = {
+        "entity_id": entity_id,
+        "state": state_obj.state,
+        "last_changed": state_obj.last_changed.isoformat(),
+    }
+    
+    wanted = attributes or DEFAULT_ATTRIBUTES
+    result["attributes"] = {
+        key: compact_value(state_obj.attributes[key])
+        for key in wanted
+        if key in state_obj.attributes
+    }
     
-    if state_obj.attributes:
-        result += "Attributes:\n"
-        for key, value in state_obj.attributes.items():
-            result += f"  {key}: {value}\n"
+    # Let the model ask for more without dumping every attribute
+    if not attributes:
+        result["available_attributes"] = [
+            key for key in state_obj.attributes if key not in result["attributes"]
+        ]
     
     return result
 
+async def get_states(
+    agent: Any,
+    entity_ids: List[str] = None,
+    domain: str = None,
+    area: str = None,
+    state: str = None,
+    attributes: List[str] = None,
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Dict[str, Any]:
+    """Read the state of many entities in one pass as a compact table."""
+    hass = agent.hass
+    attributes = list(attributes or [])
+    wanted_ids = set(entity_ids) if entity_ids else None
+    area_lower = area.lower() if area else None
+    
+    rows = []
+    states = hass.states.async_all(domain) if domain else hass.states.async_all()
+    for state_obj in states:
+        entity_id = state_obj.entity_id
+        if wanted_ids is not None and entity_id not in wanted_ids:
+            continue
+        if state and state_obj.state != state:
+            continue
+        if area_lower:
+            entity = agent.entities.get(entity_id, {})
+            area_id = entity.get("area_id")
+            if not area_id:
+                area_id = agent.devices.get(entity.get("device_id"), {}).get("area_id")
+            if area_lower not in agent.areas.get(area_id, {}).get("name", "").lower():
+                continue
+        
+        row = [entity_id, state_obj.state]
+        row.extend(compact_value(state_obj.attributes.get(key)) for key in attributes)
+        rows.append(row)
+    
+    rows.sort()
+    query = {
+        "entity_ids": sorted(wanted_ids) if wanted_ids else None,
+        "domain": domain,
+        "area": area,
+        "state": state,
+        "attributes": attributes,
+    }
+    result = paginate(rows, "rows", query, cursor, int(limit))
+    if wanted_ids:
+        # Entities left out by the filters exist and are not reported here
+        missing = {entity_id for entity_id in wanted_ids if hass.states.get(entity_id) is None}
+        if missing:
+            result["not_found"] = sorted(missing)
+    result["columns"] = ["entity_id", "state"] + attributes
+    return result
+
 async def control_entity(
     agent: Any,
     entity_id: str,
@@ -211,10 +297,14 @@ async def create_scene(
             }
         )
         
-        # Fire event
         hass.bus.async_fire(
             EVENT_SCENE_CREATED,
-            {"name": name, "entities": entities}
+            {
+                "name": name,
+                "scene_id": name.lower().replace(" ", "_"),
+                "content_hash": agent.artifacts.put({"name": name, "entities": entities}),
+                "entity_count": len(entities),
+            }
         )
         
         return f"Scene '{name}' created successfully with {len(entities)} entities."
@@ -0,0 +1,234 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from .const import RESOLVER_CANDIDATES, RESOLVER_NGRAM, RESOLVER_REWEIGHT_RATIO
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/underscores to single spaces."""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+def char_ngrams(text: str, n: int = RESOLVER_NGRAM) -> Counter:
+    """Count character n-grams of each word, padded so word edges count."""
+    grams = Counter()
+    for word in normalize(text).split():
+        padded = f" {word} "
+        if len(padded) <= n:
+            grams[padded] += 1
+            continue
+        for i in range(len(padded) - n + 1):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+def edit_similarity(a: str, b: str) -> float:
+    """Return 1 - Levenshtein distance / length of the longer string."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return 1.0 - previous[-1] / max(len(a), len(b))
+
+class EntityResolver:
+    """Fuzzy lookup of entities by the names people actually say.
+
+    Each entity is indexed by its names (entity, device, area, aliases) as a
+    TF-IDF vector of character n-grams. Queries are scored by cosine
+    similarity against a compact column store of the vectors and the best
+    candidates are re-ranked by edit distance.
+
+    Updates only rebuild the columns of the n-grams they touch, with IDF
+    weights frozen; all weights are recomputed once the index has grown or
+    shrunk by RESOLVER_REWEIGHT_RATIO since the last full pass.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, List[str]] = {}
+        self._grams: Dict[str, Counter] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._dirty_grams: Set[str] = set()
+        self._weighted_size = 0
+        self._changes = 0
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._idf: Dict[str, float] = {}
+        self._columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def update(self, entity_id: str, names: Iterable[str]) -> None:
+        """Add or replace the names indexed for an entity."""
+        self.remove(entity_id)
+        names = [normalize(name) for name in names if name]
+        names = list(dict.fromkeys(name for name in names if name))
+        if not names:
+            return
+        grams = Counter()
+        for name in names:
+            grams.update(char_ngrams(name))
+        self._names[entity_id] = names
+        self._grams[entity_id] = grams
+        for gram, count in grams.items():
+            self._postings.setdefault(gram, {})[entity_id] = count
+        self._dirty_grams.update(grams)
+        self._changes += 1
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entity from the index."""
+        grams = self._grams.pop(entity_id, None)
+        if grams is None:
+            return
+        self._names.pop(entity_id)
+        for gram in grams:
+            posting = self._postings[gram]
+            posting.pop(entity_id, None)
+            if not posting:
+                del self._postings[gram]
+        self._dirty_grams.update(grams)
+        self._changes += 1
+        
+        row = self._rows.pop(entity_id, None)
+        if row is not None:
+            self._ids[row] = None
+            self._free_rows.append(row)
+
+    def rebuild(self, entries: Iterable[Tuple[str, Iterable[str]]]) -> None:
+        """Replace the whole index and weigh it, ready for searching.
+
+        Blocking on large indexes; run in the executor.
+        """
+        self.__init__()
+        for entity_id, names in entries:
+            self.update(entity_id, names)
+        self._reweight()
+
+    @property
+    def needs_reweight(self) -> bool:
+        """Return True when the next search would recompute every weight."""
+        if not self._changes:
+            return False
+        drift = abs(len(self._names) - self._weighted_size) + self._changes
+        return not self._columns or drift > self._weighted_size * RESOLVER_REWEIGHT_RATIO
+
+    def _idf_for(self, gram: str, total: int) -> float:
+        return math.log((1 + total) / (1 + len(self._postings.get(gram, ())))) + 1
+
+    def _reweight(self) -> None:
+        """Recompute IDF weights, norms and every column."""
+        self._ids = list(self._names)
+        self._rows = {entity_id: i for i, entity_id in enumerate(self._ids)}
+        self._free_rows = []
+        total = len(self._ids)
+        self._idf = {gram: self._idf_for(gram, total) for gram in self._postings}
+        self._norms = np.ones(total, dtype=np.float32)
+        for entity_id, row in self._rows.items():
+            self._norms[row] = self._norm(entity_id)
+        self._columns = {}
+        for gram in self._postings:
+            self._build_column(gram)
+        self._dirty_grams.clear()
+        self._weighted_size = total
+        self._changes = 0
+
+    def _norm(self, entity_id: str) -> float:
+        norm = math.sqrt(sum(
+            (count * self._idf[gram]) ** 2
+            for gram, count in self._grams[entity_id].items()
+        ))
+        return norm or 1.0
+
+    def _build_column(self, gram: str) -> None:
+        posting = self._postings.get(gram)
+        if not posting:
+            self._columns.pop(gram, None)
+            return
+        rows = np.fromiter((self._rows[e] for e in posting), dtype=np.int32, count=len(posting))
+        counts = np.fromiter(posting.values(), dtype=np.float32, count=len(posting))
+        self._columns[gram] = (rows, counts * self._idf[gram] / self._norms[rows])
+
+    def _refresh(self) -> None:
+        """Bring the column store up to date with pending updates."""
+        if not self._changes:
+            return
+        if self.needs_reweight:
+            self._reweight()
+            return
+        
+        # New n-grams get an IDF from the current counts; existing ones keep theirs
+        total = max(self._weighted_size, 1)
+        for gram in self._dirty_grams:
+            if gram in self._postings and gram not in self._idf:
+                self._idf[gram] = self._idf_for(gram, total)
+        
+        # Give new entities a row (reusing rows of removed ones) and a norm
+        for entity_id in self._names:
+            if entity_id in self._rows:
+                continue
+            if self._free_rows:
+                row = self._free_rows.pop()
+                self._ids[row] = entity_id
+            else:
+                row = len(self._ids)
+                self._ids.append(entity_id)
+                self._norms = np.append(self._norms, np.float32(1.0))
+            self._rows[entity_id] = row
+            self._norms[row] = self._norm(entity_id)
+        
+        for gram in self._dirty_grams:
+            self._build_column(gram)
+        self._dirty_grams.clear()
+        self._changes = 0
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """Return up to `limit` (entity_id, score) pairs, best first."""
+        if not self._names:
+            return []
+        self._refresh()
+        
+        grams = char_ngrams(query)
+        weights = {
+            gram: count * self._idf[gram]
+            for gram, count in grams.items()
+            if gram in self._columns
+        }
+        if not weights:
+            return []
+        query_norm = math.sqrt(sum(w * w for w in weights.values()))
+        
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for gram, weight in weights.items():
+            rows, values = self._columns[gram]
+            # Each entity appears at most once per column
+            scores[rows] += values * (weight / query_norm)
+        
+        count = min(len(scores), max(limit, RESOLVER_CANDIDATES))
+        candidates = np.argpartition(-scores, count - 1)[:count]
+        candidates = candidates[scores[candidates] > 0]
+        
+        # Re-rank the best cosine matches by edit distance to catch typos
+        normalized = normalize(query)
+        ranked = []
+        for row in candidates:
+            entity_id = self._ids[row]
+            similarity = max(edit_similarity(normalized, name) for name in self._names[entity_id])
+            score = 0.7 * float(scores[row]) + 0.3 * similarity
+            if score >= min_score:
+                ranked.append((entity_id, round(score, 3)))
+        
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
@@ -2,10 +2,12 @@ from typing import Dict, Any
 from .automation_engine import create_automation
 from .troubleshooter import analyze_logs, check_configuration
 from .entity_manager import (
-    find_entities, get_entity_state, control_entity,
+    find_entities, get_entity_state, get_states, control_entity,
     create_group, create_scene
 )
 from .scene_generator import generate_scene
+from .history_analytics import get_history
+from .vision import get_camera_snapshots
 
 # Function schemas for Gemini
 FUNCTION_SCHEMAS = [
@@ -91,6 +93,8 @@ FUNCTION_SCHEMAS = [
                 "domain": {"type": "string", "description": "Entity domain (e.g., light, switch)"},
                 "area": {"type": "string", "description": "Area name"},
                 "device": {"type": "string", "description": "Device name"},
+                "cursor": {"type": "string", "description": "next_cursor from a previous result to fetch the next page"},
+                "limit": {"type": "integer", "description": "Maximum number of entities to return"},
             },
         },
     },
@@ -101,10 +105,73 @@ FUNCTION_SCHEMAS = [
             "type": "object",
             "properties": {
                 "entity_id": {"type": "string", "description": "Entity ID"},
+                "attributes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Attributes to return (optional, defaults to a small common set)"
+                },
             },
             "required": ["entity_id"],
         },
     },
+    {
+        "name": "get_states",
+        "description": "Get the state of many entities at once, selected by ID or by filter, with chosen attributes as table columns",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "entity_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Entity IDs to read (optional)"
+                },
+                "domain": {"type": "string", "description": "Entity domain (e.g., light, sensor)"},
+                "area": {"type": "string", "description": "Area name"},
+                "state": {"type": "string", "description": "Only entities in this state (e.g., on)"},
+                "attributes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Attributes to include as columns (e.g., brightness)"
+                },
+                "cursor": {"type": "string", "description": "next_cursor from a previous result to fetch the next page"},
+                "limit": {"type": "integer", "description": "Maximum number of rows to return"},
+            },
+        },
+    },
+    {
+        "name": "get_history",
+        "description": "Summarize recorded history of entities over a time window: min/max/mean and a downsampled series for numeric sensors, time spent in each state otherwise",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "entity_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Entity IDs to summarize"
+                },
+                "start": {"type": "string", "description": "Window start as ISO 8601 datetime (optional)"},
+                "end": {"type": "string", "description": "Window end as ISO 8601 datetime (optional, defaults to now)"},
+                "hours": {"type": "number", "description": "Window length in hours when start is not given (default 24)"},
+                "points": {"type": "integer", "description": "Number of points in the downsampled series (default 12)"},
+            },
+            "required": ["entity_ids"],
+        },
+    },
+    {
+        "name": "get_camera_snapshots",
+        "description": "Look at current snapshots of cameras; the images are attached after the function response",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "entity_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Camera entity IDs (up to 4)"
+                },
+            },
+            "required": ["entity_ids"],
+        },
+    },
     {
         "name": "control_entity",
         "description": "Control an entity (turn on/off, set value, etc.)",
@@ -161,6 +228,9 @@ FUNCTION_HANDLERS = {
     "check_configuration": check_configuration,
     "find_entities": find_entities,
     "get_entity_state": get_entity_state,
+    "get_states": get_states,
+    "get_history": get_history,
+    "get_camera_snapshots": get_camera_snapshots,
     "control_entity": control_entity,
     "create_group": create_group,
     "generate_scene": generate_scene,
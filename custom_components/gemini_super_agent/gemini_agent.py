@@ -1,21 +1,89 @@
+import asyncio
 import logging
 import json
-from typing import Any, Dict, List, Optional
-import google.generativeai as genai
-from homeassistant.core import HomeAssistant
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from homeassistant.core import HomeAssistant, Event, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers.debounce import Debouncer
+from .const import (
+    CONF_CACHE_TTL, CONF_CONTEXT_CACHE, CONF_FAST_MODEL, CONF_MODEL_ROUTING,
+    CONF_PRO_MODEL, CONF_VISION_MAX_BYTES, CONF_VISION_MAX_PIXELS,
+    DEFAULT_CACHE_TTL, DEFAULT_FAST_MODEL, DEFAULT_PRO_MODEL,
+    DEFAULT_VISION_MAX_BYTES, DEFAULT_VISION_MAX_PIXELS, MAX_FOCUS_ENTITIES, MAX_STATE_DELTA,
+    RECENT_TOOLS_LIMIT, REGISTRY_REFRESH_DELAY, TIER_DEFAULT, TIER_FAST, TIER_PRO
+)
+from .artifacts import ArtifactStore
+from .context_cache import ContextCacheManager
+from .entity_resolver import EntityResolver
 from .function_handlers import FUNCTION_HANDLERS, FUNCTION_SCHEMAS
+from .model_router import ModelRouter
+from .tool_selector import ENTITY_ID_PATTERN, select_tools
+from .vision import ATTACHMENTS, FrameCache
 
 _LOGGER = logging.getLogger(__name__)
 
+SYSTEM_ROLE = (
+    "You are a Home Assistant Super Agent. Use the available functions to "
+    "interact with Home Assistant. Entity states are sent at the start of a "
+    "conversation and later turns only list states that changed since the "
+    "previous turn; call get_entity_state when you need a fresh value."
+)
+
+# Stands in for the reply of a turn interrupted after its function calls ran
+INTERRUPTED_REPLY = "(Reply interrupted after the function calls above were made.)"
+
+def _load_sdk(api_key: str) -> Any:
+    """Import and configure the Gemini SDK; blocking, run in the executor."""
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai
+
 class GeminiAgent:
     def __init__(self, hass: HomeAssistant, config_data: dict):
+        # Construction is cheap; the SDK and caches are loaded by async_start
         self.hass = hass
-        genai.configure(api_key=config_data["api_key"])
-        self.model = genai.GenerativeModel(config_data.get("model", "gemini-pro"))
+        self.api_key = config_data["api_key"]
+        self.genai = None
+        self.model = None
+        self.models: Dict[str, Any] = {}
+        self.system_instruction = None
+        self._ready = hass.loop.create_future()
+        self._registry_stale = False
+        self._registry_changes = 0
+        # Setup and warm-up durations in seconds, reported in diagnostics
+        self.timings: Dict[str, float] = {}
+        self.model_name = config_data.get("model", "gemini-pro")
+        tiers = {TIER_DEFAULT: self.model_name}
+        if config_data.get(CONF_MODEL_ROUTING):
+            tiers[TIER_FAST] = config_data.get(CONF_FAST_MODEL, DEFAULT_FAST_MODEL)
+            tiers[TIER_PRO] = config_data.get(CONF_PRO_MODEL, DEFAULT_PRO_MODEL)
+        self.router = ModelRouter(tiers)
         self.chat_sessions = {}
+        # Last entity states sent to the model, per conversation
+        self.state_snapshots: Dict[str, Dict[str, str]] = {}
+        # Tools called recently, per conversation
+        self.recent_tools: Dict[str, deque] = {}
+        # Entities mentioned or touched recently, per conversation, most
+        # recent last; their state changes are reported first
+        self.focus_entities: Dict[str, OrderedDict] = {}
+        # In-flight websocket requests, per conversation
+        self.active_requests: Dict[str, asyncio.Task] = {}
+        # Active profiling session and the summary of the last one
+        self.profiler = None
+        self.last_profile: Optional[Dict[str, Any]] = None
+        # Full payloads behind the integration's slim events
+        self.artifacts = ArtifactStore()
+        # Recent downscaled camera snapshots for vision requests
+        self.frame_cache = FrameCache(
+            hass,
+            max_pixels=config_data.get(CONF_VISION_MAX_PIXELS, DEFAULT_VISION_MAX_PIXELS),
+            max_bytes=config_data.get(CONF_VISION_MAX_BYTES, DEFAULT_VISION_MAX_BYTES),
+        )
         self.functions = FUNCTION_SCHEMAS
         self.function_handlers = FUNCTION_HANDLERS
         
@@ -28,123 +96,622 @@ class GeminiAgent:
         self.entities = {}
         self.devices = {}
         self.areas = {}
+        
+        # Local fuzzy index of entity, device and area names
+        self.resolver = EntityResolver()
+        
+        self.context_cache = None
+        if config_data.get(CONF_CONTEXT_CACHE):
+            self.context_cache = ContextCacheManager(
+                hass, ttl=config_data.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+            )
+        
+        # Registry changes arrive in bursts; the model is rebuilt once per burst
+        self._model_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=REGISTRY_REFRESH_DELAY,
+            immediate=False,
+            function=self._async_rebuild_model,
+        )
+        
+        # Keep the snapshot in sync with the registries
+        self._unsub_listeners = [
+            hass.bus.async_listen(event_type, self._async_registry_updated)
+            for event_type in (
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                ar.EVENT_AREA_REGISTRY_UPDATED,
+            )
+        ]
+
+    @property
+    def ready(self) -> bool:
+        """Return True once the SDK and caches are loaded."""
+        return (
+            self._ready.done()
+            and not self._ready.cancelled()
+            and self._ready.exception() is None
+        )
+
+    async def async_start(self):
+        """Load the SDK and warm the registry caches in the background."""
+        started = time.monotonic()
+        try:
+            self.genai = await self.hass.async_add_executor_job(_load_sdk, self.api_key)
+            self.timings["sdk_load"] = time.monotonic() - started
+            
+            await self._async_warm_caches()
+            
+            # The registry snapshot is stable, so it goes out once as the system
+            # instruction instead of being repeated in every user message.
+            self._build_model()
+        except Exception as e:
+            _LOGGER.error(f"Error starting Gemini Super Agent: {str(e)}")
+            self._ready.set_exception(e)
+            # Consumed by waiting requests; avoid "exception never retrieved"
+            self._ready.exception()
+            return
+        
+        self.timings["warm_up"] = time.monotonic() - started
+        self._ready.set_result(None)
+        _LOGGER.debug(f"Gemini Super Agent ready in {self.timings['warm_up']:.3f}s")
+
+    async def _async_warm_caches(self):
+        """Cache the registries and build the fuzzy index off the event loop."""
+        started = time.monotonic()
+        self._registry_stale = False
         self._cache_registries()
+        entries = [
+            (entity_id, self._entity_names(entity_id)) for entity_id in self.entities
+        ]
+        resolver = EntityResolver()
+        await self.hass.async_add_executor_job(resolver.rebuild, entries)
+        self.resolver = resolver
+        
+        # Registry changes during the build are picked up with one more pass
+        if self._registry_stale:
+            await self._async_warm_caches()
+            return
+        self.timings["cache_warm_up"] = time.monotonic() - started
 
-    def _cache_registries(self):
-        """Cache Home Assistant entities, devices, and areas."""
-        # Cache entities
-        for entity_id, entry in self.entity_registry.entities.items():
-            self.entities[entity_id] = {
-                "name": entry.name or entry.original_name,
-                "device_id": entry.device_id,
-                "area_id": entry.area_id,
-                "entity_id": entity_id,
-                "domain": entry.domain,
-            }
+    async def async_wait_ready(self):
+        """Wait until the agent can serve requests."""
+        await asyncio.shield(self._ready)
+
+    def _build_model(self):
+        """Build the model with the current registry snapshot."""
+        self.system_instruction = self._build_system_instruction()
+        self.models = {
+            model_name: self.genai.GenerativeModel(
+                model_name,
+                system_instruction=self.system_instruction,
+            )
+            for model_name in set(self.router.tiers.values())
+        }
+        self.model = self.models[self.model_name]
+
+    async def _async_rebuild_model(self):
+        """Rebuild the system instruction after registry changes settle."""
+        if not self.ready:
+            return
+        self._build_model()
         
-        # Cache devices
-        for device_id, entry in self.device_registry.devices.items():
-            self.devices[device_id] = {
-                "name": entry.name,
-                "area_id": entry.area_id,
-                "manufacturer": entry.manufacturer,
-                "model": entry.model,
-            }
+        # After many changes the next search would reweigh the whole fuzzy
+        # index on the event loop; build a fresh one in the executor instead
+        if not self.resolver.needs_reweight:
+            return
+        changes = self._registry_changes
+        entries = [
+            (entity_id, self._entity_names(entity_id)) for entity_id in self.entities
+        ]
+        resolver = EntityResolver()
+        await self.hass.async_add_executor_job(resolver.rebuild, entries)
+        # Changes during the build schedule another rebuild
+        if changes == self._registry_changes:
+            self.resolver = resolver
+
+    @callback
+    def _async_registry_updated(self, event: Event):
+        """Update the cached entries affected by a registry change."""
+        if not self.ready:
+            self._registry_stale = True
+            return
+        self._registry_changes += 1
         
-        # Cache areas
-        for area_id, entry in self.area_registry.areas.items():
-            self.areas[area_id] = {
-                "name": entry.name,
-                "picture": entry.picture,
+        data = event.data
+        if "entity_id" in data:
+            changed = {data["entity_id"]}
+            if data.get("old_entity_id"):
+                self.entities.pop(data["old_entity_id"], None)
+                self.resolver.remove(data["old_entity_id"])
+            self._cache_entity(data["entity_id"])
+        elif "device_id" in data:
+            self._cache_device(data["device_id"])
+            changed = {
+                entity_id for entity_id, entity in self.entities.items()
+                if entity.get("device_id") == data["device_id"]
+            }
+        else:
+            self._cache_area(data.get("area_id"))
+            changed = {
+                entity_id for entity_id in self.entities
+                if self._entity_area_id(entity_id) == data.get("area_id")
             }
+        
+        # Only re-index the entities affected by the change
+        for entity_id in changed:
+            if entity_id in self.entities:
+                self.resolver.update(entity_id, self._entity_names(entity_id))
+            else:
+                self.resolver.remove(entity_id)
+        
+        self._model_debouncer.async_schedule_call()
+
+    def _entity_area_id(self, entity_id: str) -> Optional[str]:
+        """Return the entity's area, falling back to its device's area."""
+        entity = self.entities.get(entity_id, {})
+        if entity.get("area_id"):
+            return entity["area_id"]
+        return self.devices.get(entity.get("device_id"), {}).get("area_id")
+
+    def _entity_names(self, entity_id: str) -> List[str]:
+        """Return the names an entity may be referred to by."""
+        entity = self.entities.get(entity_id, {})
+        device = self.devices.get(entity.get("device_id"), {})
+        area = self.areas.get(self._entity_area_id(entity_id), {})
+        name = entity.get("name") or ""
+        area_name = area.get("name") or ""
+        
+        names = [name, entity_id.split(".", 1)[-1], device.get("name") or ""]
+        names.extend(entity.get("aliases", []))
+        if area_name and area_name.lower() not in name.lower():
+            names.append(f"{area_name} {name}")
+        return names
+
+    async def async_shutdown(self):
+        """Stop listening for registry changes and drop cached content."""
+        for unsub in self._unsub_listeners:
+            unsub()
+        self._unsub_listeners = []
+        self._model_debouncer.async_cancel()
+        for task in self.active_requests.values():
+            task.cancel()
+        self.active_requests.clear()
+        if not self._ready.done():
+            self._ready.cancel()
+        if self.profiler:
+            await self.profiler.async_stop()
+        self.frame_cache.clear()
+        if self.context_cache:
+            await self.context_cache.async_clear()
 
-    async def process_request(self, user_input: str, conversation_id: str = "default") -> str:
-        """Process a natural language request from the user."""
+    def _cache_registries(self):
+        """Cache Home Assistant entities, devices, and areas."""
+        self.entities.clear()
+        self.devices.clear()
+        self.areas.clear()
+        
+        for entity_id in self.entity_registry.entities:
+            self._cache_entity(entity_id)
+        for device_id in self.device_registry.devices:
+            self._cache_device(device_id)
+        for area_id in self.area_registry.areas:
+            self._cache_area(area_id)
+
+    def _cache_entity(self, entity_id: str):
+        """Cache an entity, or drop it when it left the registry."""
+        entry = self.entity_registry.async_get(entity_id)
+        if entry is None:
+            self.entities.pop(entity_id, None)
+            return
+        self.entities[entity_id] = {
+            "name": entry.name or entry.original_name,
+            "device_id": entry.device_id,
+            "area_id": entry.area_id,
+            "entity_id": entity_id,
+            "domain": entry.domain,
+            "aliases": list(entry.aliases),
+        }
+
+    def _cache_device(self, device_id: str):
+        """Cache a device, or drop it when it left the registry."""
+        entry = self.device_registry.async_get(device_id)
+        if entry is None:
+            self.devices.pop(device_id, None)
+            return
+        self.devices[device_id] = {
+            "name": entry.name,
+            "area_id": entry.area_id,
+            "manufacturer": entry.manufacturer,
+            "model": entry.model,
+        }
+
+    def _cache_area(self, area_id: Optional[str]):
+        """Cache an area, or drop it when it left the registry."""
+        entry = self.area_registry.async_get_area(area_id) if area_id else None
+        if entry is None:
+            self.areas.pop(area_id, None)
+            return
+        self.areas[area_id] = {
+            "name": entry.name,
+            "picture": entry.picture,
+        }
+
+    async def process_request(
+        self,
+        user_input: str,
+        conversation_id: str = "default",
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Process a natural language request from the user.
+
+        When on_chunk is given, response text is streamed to it as it
+        arrives. Cancelling the request stops the model call and any pending
+        function handlers. The chat history is left as it was unless a
+        handler already ran; then the calls and their results are kept.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return await self._async_process_request(user_input, conversation_id, on_chunk)
+        try:
+            return await self._async_process_request(user_input, conversation_id, on_chunk)
+        finally:
+            profiler.request_finished()
+
+    async def _async_process_request(
+        self,
+        user_input: str,
+        conversation_id: str,
+        on_chunk: Optional[Callable[[str], None]]
+    ) -> str:
+        # Requests arriving during warm-up wait for it to finish
+        await self.async_wait_ready()
+        
         # Get or create chat session
         if conversation_id not in self.chat_sessions:
             self.chat_sessions[conversation_id] = self.model.start_chat(history=[])
         
         chat = self.chat_sessions[conversation_id]
+        recent_tools = self.recent_tools.setdefault(
+            conversation_id, deque(maxlen=RECENT_TOOLS_LIMIT)
+        )
         
-        # Build context with Home Assistant state
-        context = self._build_context()
-        
-        # Create prompt with context
-        prompt = f"""
-        You are a Home Assistant Super Agent with access to the following devices and entities:
+        # Only offer the tools the request is likely to need
+        focus = self.focus_entities.setdefault(conversation_id, OrderedDict())
+        self._note_entities(focus, user_input)
+        tools, mode = select_tools(user_input, recent_tools, self.functions)
         
-        {context}
+        # Only send the states that changed since the previous turn
+        state_context, snapshot = self._build_state_context(conversation_id)
+        prompt = f"{state_context}\n\nUser request: {user_input}"
         
-        User request: {user_input}
+        tier = self.router.route(user_input, tools, len(chat.history))
         
-        Please help the user with their request. Use the available functions to interact with Home Assistant.
-        """
+        # Until a handler runs, a failed, cancelled or escalated request
+        # leaves the history and recent tools as they were
+        history = list(chat.history)
+        tools_before = list(recent_tools)
+        try:
+            while True:
+                send_kwargs, cached = await self._async_prepare_model(
+                    chat, self.router.tiers[tier], tools, mode
+                )
+                
+                # Text from a tier that may still be rejected is held back
+                # until the tier is accepted, so callers never see it twice
+                next_tier = self.router.escalation(tier)
+                chunks = [] if next_tier and on_chunk else None
+                
+                # Send message to Gemini
+                started = time.monotonic()
+                response = await self._async_send(
+                    chat, prompt, chunks.append if chunks is not None else on_chunk, **send_kwargs
+                )
+                latency = time.monotonic() - started
+                if self.context_cache:
+                    self.context_cache.record_usage(response, latency, cached)
+                
+                # Retry on a stronger model before running anything invalid
+                if next_tier and not self._valid_function_calls(response, mode):
+                    _LOGGER.debug(f"Escalating request from {tier} to {next_tier} tier")
+                    self.router.record(tier, latency, escalated=True)
+                    chat.history = history
+                    tier = next_tier
+                    continue
+                self.router.record(tier, latency)
+                for text in chunks or ():
+                    on_chunk(text)
+                break
+        except (Exception, asyncio.CancelledError):
+            chat.history = history
+            recent_tools.clear()
+            recent_tools.extend(tools_before)
+            raise
         
-        # Send message to Gemini
-        response = await self.hass.async_add_executor_job(
-            lambda: chat.send_message(
-                prompt,
-                tools=self.functions,
-                tool_config={"function_calling_config": "ANY"}
+        try:
+            return await self._async_run_functions(chat, response, recent_tools, focus, on_chunk)
+        finally:
+            # The prompt with these states stays in the history from here on
+            self.state_snapshots[conversation_id] = snapshot
+
+    async def _async_prepare_model(
+        self,
+        chat: Any,
+        model_name: str,
+        tools: List[Dict[str, Any]],
+        mode: str
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Point the chat at a model and return the send arguments for it."""
+        # Reference the cached static prefix when available; the cache
+        # carries the system instruction, the full tool list and the mode,
+        # and the API rejects tools or a tool config sent next to it.
+        model = None
+        if self.context_cache:
+            model = await self.context_cache.async_get_model(
+                model_name, self.system_instruction, self.functions, mode
             )
-        )
+        if model is not None:
+            chat.model = model
+            return {}, True
+        
+        chat.model = self.models[model_name]
+        return {"tools": tools, "tool_config": {"function_calling_config": mode}}, False
+
+    def _valid_function_calls(self, response: Any, mode: str) -> bool:
+        """Check that a response calls known functions with valid arguments."""
+        function_calls = response.function_calls
+        if not function_calls:
+            # A reply without a call is only a failure when a call was forced
+            return mode != "ANY"
         
+        schemas = {schema["name"]: schema["parameters"] for schema in self.functions}
+        for function_call in function_calls:
+            parameters = schemas.get(function_call.name)
+            if parameters is None:
+                return False
+            args = set(function_call.args)
+            if not args <= set(parameters.get("properties", {})):
+                return False
+            if not set(parameters.get("required", [])) <= args:
+                return False
+        return True
+
+    async def _async_run_functions(
+        self,
+        chat: Any,
+        response: Any,
+        recent_tools: deque,
+        focus: OrderedDict,
+        on_chunk: Optional[Callable[[str], None]]
+    ) -> str:
+        """Run the functions a response asks for and return the final reply."""
         # Process function calls if any
-        if response.function_calls:
+        function_calls = response.function_calls
+        if function_calls:
+            history = list(chat.history)
             function_responses = []
-            for function_call in response.function_calls:
-                function_name = function_call.name
-                function_args = function_call.args
-                
-                _LOGGER.info(f"Calling function: {function_name} with args: {function_args}")
+            # Handlers such as get_camera_snapshots add images here
+            attachments = []
+            try:
+                token = ATTACHMENTS.set(attachments)
+                try:
+                    await self._async_call_handlers(response, function_responses, recent_tools, focus)
+                finally:
+                    ATTACHMENTS.reset(token)
                 
-                handler = self.function_handlers.get(function_name)
-                if handler:
-                    try:
-                        result = await handler(self, **function_args)
-                        function_responses.append(
-                            {"name": function_name, "response": result}
-                        )
-                    except Exception as e:
-                        _LOGGER.error(f"Error in function {function_name}: {str(e)}")
-                        function_responses.append(
-                            {"name": function_name, "error": str(e)}
-                        )
-                else:
+                # Send function responses back to Gemini
+                content = [{"function_response": fr} for fr in function_responses]
+                content.extend(
+                    {"mime_type": frame.mime_type, "data": frame.data} for frame in attachments
+                )
+                response = await self._async_send(chat, content, on_chunk)
+            except (Exception, asyncio.CancelledError):
+                self._keep_interrupted_turn(chat, history, function_calls, function_responses)
+                raise
+            if attachments:
+                self._drop_attachments(chat)
+        
+        return response.text
+
+    def _keep_interrupted_turn(
+        self,
+        chat: Any,
+        history: List[Any],
+        function_calls: List[Any],
+        function_responses: List[Dict[str, Any]]
+    ):
+        """Keep the function calls of a turn whose reply never arrived.
+
+        Handlers may already have changed the house, so the calls stay in
+        the history with their results; calls that did not finish are
+        answered with an error and a short model turn stands in for the
+        reply.
+        """
+        responses = list(function_responses)
+        for function_call in list(function_calls)[len(responses):]:
+            responses.append({
+                "name": function_call.name,
+                "response": {"error": "Interrupted before the call finished"},
+            })
+        chat.history = history + [
+            {"role": "user", "parts": [{"function_response": fr} for fr in responses]},
+            {"role": "model", "parts": [{"text": INTERRUPTED_REPLY}]},
+        ]
+
+    def _drop_attachments(self, chat: Any):
+        """Replace the images of the last function response with a placeholder.
+
+        Images are only needed for the reply they were sent with; left in the
+        history they would be uploaded again on every later turn.
+        """
+        history = list(chat.history)
+        for index in range(len(history) - 1, -1, -1):
+            content = history[index]
+            if content.role != "user":
+                continue
+            parts = [part for part in content.parts if "inline_data" not in part]
+            dropped = len(content.parts) - len(parts)
+            if dropped:
+                parts.append(self.genai.protos.Part(
+                    text=f"[{dropped} camera snapshot(s) shown earlier, omitted from history]"
+                ))
+                history[index] = self.genai.protos.Content(role=content.role, parts=parts)
+                chat.history = history
+            return
+
+    async def _async_call_handlers(
+        self,
+        response: Any,
+        function_responses: List[Dict[str, Any]],
+        recent_tools: deque,
+        focus: OrderedDict
+    ):
+        """Run the handler of each function call in a response."""
+        for function_call in response.function_calls:
+            function_name = function_call.name
+            function_args = function_call.args
+            recent_tools.append(function_name)
+            self._note_entities(focus, function_args)
+            
+            _LOGGER.info(f"Calling function: {function_name} with args: {function_args}")
+            
+            handler = self.function_handlers.get(function_name)
+            if handler:
+                try:
+                    result = await handler(self, **function_args)
+                    if not isinstance(result, dict):
+                        result = {"result": result}
+                    self._note_entities(focus, result)
                     function_responses.append(
-                        {"name": function_name, "error": "Handler not found"}
+                        {"name": function_name, "response": result}
                     )
-            
-            # Send function responses back to Gemini
-            response = await self.hass.async_add_executor_job(
-                lambda: chat.send_message(
-                    [
-                        {"function_response": fr}
-                        for fr in function_responses
-                    ]
+                except Exception as e:
+                    _LOGGER.error(f"Error in function {function_name}: {str(e)}")
+                    function_responses.append(
+                        {"name": function_name, "response": {"error": str(e)}}
+                    )
+            else:
+                function_responses.append(
+                    {"name": function_name, "response": {"error": "Handler not found"}}
                 )
-            )
+
+    async def _async_send(
+        self,
+        chat: Any,
+        content: Any,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        **kwargs: Any
+    ) -> Any:
+        """Send a message with the async client, streaming text if requested."""
+        if on_chunk is None:
+            return await chat.send_message_async(content, **kwargs)
         
-        return response.text
+        response = await chat.send_message_async(content, stream=True, **kwargs)
+        async for chunk in response:
+            text = "".join(getattr(part, "text", "") for part in chunk.parts)
+            if text:
+                on_chunk(text)
+        return response
 
-    def _build_context(self) -> str:
-        """Build context string with Home Assistant state."""
-        context = "Entities:\n"
+    def _build_system_instruction(self) -> str:
+        """Build the stable system instruction with the registry snapshot."""
+        lines = [SYSTEM_ROLE, "", "Entities:"]
         
         # Add entities
         for entity_id, entity in self.entities.items():
-            state = self.hass.states.get(entity_id)
-            state_str = state.state if state else "unknown"
-            context += f"- {entity_id}: {entity.get('name', 'Unnamed')} (State: {state_str})\n"
+            line = f"- {entity_id}: {entity.get('name') or 'Unnamed'}"
+            area = self.areas.get(entity.get("area_id"))
+            if area:
+                line += f" (Area: {area.get('name')})"
+            lines.append(line)
         
         # Add devices
-        context += "\nDevices:\n"
+        lines.extend(["", "Devices:"])
         for device_id, device in self.devices.items():
-            context += f"- {device_id}: {device.get('name', 'Unnamed')} ({device.get('manufacturer', 'Unknown')} {device.get('model', 'Model')})\n"
+            lines.append(
+                f"- {device_id}: {device.get('name') or 'Unnamed'} "
+                f"({device.get('manufacturer') or 'Unknown'} {device.get('model') or 'Model'})"
+            )
         
         # Add areas
-        context += "\nAreas:\n"
+        lines.extend(["", "Areas:"])
         for area_id, area in self.areas.items():
-            context += f"- {area_id}: {area.get('name', 'Unnamed')}\n"
+            lines.append(f"- {area_id}: {area.get('name') or 'Unnamed'}")
+        
+        return "\n".join(lines)
+
+    def _current_states(self) -> Dict[str, str]:
+        """Return the current state of every cached entity."""
+        current = {}
+        for entity_id in self.entities:
+            state = self.hass.states.get(entity_id)
+            current[entity_id] = state.state if state else "unknown"
+        return current
+
+    def describe_states(self, states: Optional[Dict[str, str]] = None) -> str:
+        """Describe entity states, by default the current ones."""
+        if states is None:
+            states = self._current_states()
+        lines = ["Current entity states:"]
+        lines.extend(f"- {entity_id}: {state}" for entity_id, state in states.items())
+        return "\n".join(lines)
+
+    def discard_conversation(self, conversation_id: str):
+        """Forget the chat session and per-conversation state."""
+        self.chat_sessions.pop(conversation_id, None)
+        self.state_snapshots.pop(conversation_id, None)
+        self.recent_tools.pop(conversation_id, None)
+        self.focus_entities.pop(conversation_id, None)
+
+    def _note_entities(self, focus: OrderedDict, value: Any):
+        """Record the known entity IDs found in a prompt, arguments or result."""
+        if isinstance(value, str):
+            for entity_id in ENTITY_ID_PATTERN.findall(value.lower()):
+                if entity_id in self.entities:
+                    focus[entity_id] = True
+                    focus.move_to_end(entity_id)
+            while len(focus) > MAX_FOCUS_ENTITIES:
+                focus.popitem(last=False)
+        elif isinstance(value, Mapping):
+            for item in value.values():
+                self._note_entities(focus, item)
+        elif isinstance(value, Iterable):
+            for item in value:
+                self._note_entities(focus, item)
+
+    def _build_state_context(self, conversation_id: str) -> Tuple[str, Dict[str, str]]:
+        """Build the state section for the next turn of a conversation.
+
+        The first turn carries the current state of every entity; later turns
+        only carry the entities whose state changed since the last turn, the
+        ones the conversation mentioned or touched first.
+        Returns the section and the snapshot to keep once the turn succeeds.
+        """
+        current = self._current_states()
+        previous = self.state_snapshots.get(conversation_id)
+        if previous is None:
+            return self.describe_states(current), current
+        
+        changed = [
+            entity_id for entity_id, state in current.items()
+            if previous.get(entity_id) != state
+        ]
+        if not changed:
+            return "No entity state changes since the last turn.", previous
+        
+        # Entities in play come first so busy sensors cannot crowd them out;
+        # the sort is stable, so the rest keep registry order
+        focus = self.focus_entities.get(conversation_id, {})
+        rank = {entity_id: i for i, entity_id in enumerate(reversed(focus))}
+        changed.sort(key=lambda entity_id: rank.get(entity_id, len(rank)))
         
-        return context
\ No newline at end of file
+        # Changes left out because of the cap are reported on a later turn
+        snapshot = dict(previous)
+        lines = ["Entity state changes since the last turn:"]
+        for entity_id in changed[:MAX_STATE_DELTA]:
+            lines.append(f"- {entity_id}: {previous.get(entity_id, 'unknown')} -> {current[entity_id]}")
+            snapshot[entity_id] = current[entity_id]
+        if len(changed) > MAX_STATE_DELTA:
+            lines.append(f"- ... and {len(changed) - MAX_STATE_DELTA} more")
+        return "\n".join(lines), snapshot
@@ -0,0 +1,156 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+import numpy as np
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from .const import DEFAULT_HISTORY_HOURS, MAX_HISTORY_ENTITIES, MAX_HISTORY_POINTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# States that are gaps in the data rather than values
+GAP_STATES = {STATE_UNAVAILABLE, STATE_UNKNOWN}
+
+async def get_history(
+    agent: Any,
+    entity_ids: List[str],
+    start: str = None,
+    end: str = None,
+    hours: float = DEFAULT_HISTORY_HOURS,
+    points: int = 12
+) -> Dict[str, Any]:
+    """Summarize recorded history of entities over a time window."""
+    hass = agent.hass
+    entity_ids = list(entity_ids)[:MAX_HISTORY_ENTITIES]
+    if not entity_ids:
+        return {"error": "At least one entity_id is required."}
+    
+    end_time = _parse_time(end) or dt_util.utcnow()
+    start_time = _parse_time(start) or end_time - timedelta(hours=float(hours))
+    if start_time >= end_time:
+        return {"error": "start must be before end."}
+    points = max(1, min(int(points), MAX_HISTORY_POINTS))
+    
+    try:
+        # Query and aggregate in the recorder's executor, off the event loop
+        summaries = await get_instance(hass).async_add_executor_job(
+            _query_and_summarize, hass, entity_ids, start_time, end_time, points
+        )
+    except Exception as e:
+        _LOGGER.error(f"Error reading history: {str(e)}")
+        return {"error": f"Error reading history: {str(e)}"}
+    
+    return {
+        "start": start_time.isoformat(),
+        "end": end_time.isoformat(),
+        "entities": summaries,
+    }
+
+def _parse_time(value: str):
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        return None
+    return dt_util.as_utc(parsed)
+
+def _query_and_summarize(
+    hass: HomeAssistant,
+    entity_ids: List[str],
+    start_time: datetime,
+    end_time: datetime,
+    points: int
+) -> Dict[str, Any]:
+    """Fetch state history and reduce each entity to a summary."""
+    states = history.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state=True,
+        significant_changes_only=False,
+        no_attributes=True,
+    )
+    
+    start_ts = start_time.timestamp()
+    end_ts = end_time.timestamp()
+    summaries = {}
+    for entity_id in entity_ids:
+        rows = states.get(entity_id)
+        if not rows:
+            summaries[entity_id] = {"error": "No history in this window."}
+            continue
+        
+        # The start-time state may predate the window; clamp it to the start
+        times = np.fromiter(
+            (max(row.last_changed.timestamp(), start_ts) for row in rows),
+            dtype=float,
+            count=len(rows),
+        )
+        values = np.array([row.state for row in rows], dtype=object)
+        summaries[entity_id] = summarize_series(times, values, start_ts, end_ts, points)
+    
+    return summaries
+
+def summarize_series(
+    times: np.ndarray,
+    values: np.ndarray,
+    start_ts: float,
+    end_ts: float,
+    points: int
+) -> Dict[str, Any]:
+    """Aggregate a step series of states with vectorized operations.
+
+    Numeric series get min/max/time-weighted mean and a downsampled series;
+    other series get the time spent in each state and the number of changes.
+    """
+    # Each state lasts until the next change or the end of the window
+    durations = np.diff(np.append(times, end_ts)).clip(min=0)
+    valid = ~np.isin(values, list(GAP_STATES))
+    summary = {
+        "changes": int(np.count_nonzero(values[1:] != values[:-1])),
+        "last": values[-1],
+    }
+    if not valid.any():
+        summary["unavailable_seconds"] = round(float(durations.sum()))
+        return summary
+    
+    numbers = np.full(len(values), np.nan)
+    try:
+        numbers[valid] = values[valid].astype(float)
+        numeric = True
+    except ValueError:
+        numeric = False
+    
+    gap_seconds = float(durations[~valid].sum())
+    if gap_seconds:
+        summary["unavailable_seconds"] = round(gap_seconds)
+    
+    if numeric:
+        weights = durations[valid]
+        observed = numbers[valid]
+        total = weights.sum()
+        mean = float((observed * weights).sum() / total) if total else float(observed.mean())
+        summary.update({
+            "min": round(float(observed.min()), 2),
+            "max": round(float(observed.max()), 2),
+            "mean": round(mean, 2),
+        })
+        
+        # Sample the step function at the middle of each bucket
+        step = (end_ts - start_ts) / points
+        grid = start_ts + step * (np.arange(points) + 0.5)
+        index = np.searchsorted(times, grid, side="right") - 1
+        sampled = np.where(index >= 0, numbers[index.clip(min=0)], np.nan)
+        summary["series"] = [None if np.isnan(v) else round(float(v), 2) for v in sampled]
+        summary["series_step_minutes"] = round(step / 60, 1)
+        return summary
+    
+    labels, inverse = np.unique(values[valid].astype(str), return_inverse=True)
+    seconds = np.bincount(inverse, weights=durations[valid], minlength=len(labels))
+    summary["seconds_in_state"] = {
+        str(label): round(float(total)) for label, total in zip(labels, seconds)
+    }
+    return summary
@@ -0,0 +1,101 @@
+import re
+from typing import Any, Dict, List, Optional
+from .const import TIER_DEFAULT, TIER_FAST, TIER_PRO
+
+TIER_ORDER = [TIER_FAST, TIER_DEFAULT, TIER_PRO]
+
+# Wording that suggests multi-step reasoning or generated configuration
+COMPLEX_PATTERN = re.compile(
+    r"\b(?:automations?|schedule|write|plan|design|explain|why|troubleshoot|"
+    r"analy[sz]e|compare|optimi[sz]e|several|multiple|each|every)\b"
+)
+
+# Tools whose arguments are large or that need the model to reason
+HEAVY_TOOLS = {"create_automation", "generate_scene", "analyze_logs", "check_configuration", "get_history"}
+
+class ModelRouter:
+    """Pick a model tier for each request and track how the tiers perform.
+
+    Requests are scored on length, wording, the tools selected for them and
+    the length of the conversation, and sent to the cheapest configured tier
+    that covers the score. A request can be escalated to the next tier up
+    when its tier fails to produce a valid function call.
+    """
+
+    def __init__(self, tiers: Dict[str, str]):
+        # Only tiers with a model configured take part in routing
+        self.tiers = {tier: tiers[tier] for tier in TIER_ORDER if tiers.get(tier)}
+        self.stats = {
+            tier: {"model": model, "requests": 0, "hits": 0, "escalations": 0, "latency": 0.0}
+            for tier, model in self.tiers.items()
+        }
+
+    def route(self, user_input: str, tools: List[Dict[str, Any]], history_length: int) -> str:
+        """Return the tier for a request."""
+        text = user_input.lower()
+        score = 0
+        
+        words = len(text.split())
+        if words > 40:
+            score += 2
+        elif words > 15:
+            score += 1
+        
+        score += min(len(COMPLEX_PATTERN.findall(text)), 2)
+        
+        names = {tool["name"] for tool in tools}
+        if names & HEAVY_TOOLS:
+            score += 2
+        if len(names) > 4:
+            score += 1
+        
+        # Long conversations carry more context to reason over
+        if history_length > 12:
+            score += 1
+        
+        if score <= 1:
+            wanted = TIER_FAST
+        elif score <= 3:
+            wanted = TIER_DEFAULT
+        else:
+            wanted = TIER_PRO
+        return self._nearest(wanted)
+
+    def _nearest(self, wanted: str) -> str:
+        """Return the wanted tier, or the closest configured one above it."""
+        index = TIER_ORDER.index(wanted)
+        for tier in TIER_ORDER[index:] + TIER_ORDER[index - 1::-1]:
+            if tier in self.tiers:
+                return tier
+        raise ValueError("No model tiers configured")
+
+    def escalation(self, tier: str) -> Optional[str]:
+        """Return the next configured tier above this one, if any."""
+        for higher in TIER_ORDER[TIER_ORDER.index(tier) + 1:]:
+            if higher in self.tiers:
+                return higher
+        return None
+
+    def record(self, tier: str, latency: float, escalated: bool = False) -> None:
+        """Record one model call on a tier."""
+        stats = self.stats[tier]
+        stats["requests"] += 1
+        stats["latency"] += latency
+        if escalated:
+            stats["escalations"] += 1
+        else:
+            stats["hits"] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Return per-tier hit rates and average latency."""
+        report = {}
+        for tier, stats in self.stats.items():
+            requests = stats["requests"]
+            report[tier] = {
+                "model": stats["model"],
+                "requests": requests,
+                "escalations": stats["escalations"],
+                "hit_rate": round(stats["hits"] / requests, 3) if requests else None,
+                "avg_latency": round(stats["latency"] / requests, 3) if requests else None,
+            }
+        return report
@@ -0,0 +1,180 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from .const import PROFILE_MODE_DETERMINISTIC, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Only functions defined in this package are reported
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class ProfileSession:
+    """A time-boxed profile of the integration's code paths.
+
+    The deterministic mode runs cProfile on the event loop thread; the
+    sampling mode walks the loop thread's stack from a background thread
+    every PROFILE_SAMPLE_INTERVAL seconds. Either way the session ends after
+    `max_requests` finished requests or `duration` seconds, whichever comes
+    first. Nothing is installed while no session is running.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        mode: str,
+        max_requests: int,
+        duration: float,
+        on_done: Callable[["ProfileSession"], None]
+    ):
+        self.hass = hass
+        self.mode = mode
+        self.max_requests = max_requests
+        self.duration = duration
+        self.on_done = on_done
+        self.requests = 0
+        self.summary: Optional[Dict[str, Any]] = None
+        self._started = 0.0
+        self._profiler: Optional[cProfile.Profile] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._samples = 0
+        self._cumulative: Counter = Counter()
+        self._own: Counter = Counter()
+        self._unsub_timer = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """Start profiling; must be called from the event loop."""
+        self._started = time.monotonic()
+        if self.mode == PROFILE_MODE_DETERMINISTIC:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._thread = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(),),
+                name="gemini_super_agent_profiler",
+                daemon=True,
+            )
+            self._thread.start()
+        self._unsub_timer = async_call_later(self.hass, self.duration, self._async_timeout)
+
+    @callback
+    def request_finished(self) -> None:
+        """Count a finished request and stop once enough were profiled."""
+        self.requests += 1
+        if self.requests >= self.max_requests:
+            self.hass.async_create_task(self.async_stop())
+
+    @callback
+    def _async_timeout(self, _now: Any) -> None:
+        self._unsub_timer = None
+        self.hass.async_create_task(self.async_stop())
+
+    async def async_stop(self) -> None:
+        """Stop profiling, write the summary and report it."""
+        if self._stopping:
+            return
+        self._stopping = True
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        
+        elapsed = time.monotonic() - self._started
+        if self._profiler:
+            self._profiler.disable()
+            functions = self._deterministic_top()
+        else:
+            self._stop_sampling.set()
+            await self.hass.async_add_executor_job(self._thread.join)
+            functions = self._sampling_top()
+        
+        self.summary = {
+            "mode": self.mode,
+            "finished": dt_util.utcnow().isoformat(),
+            "seconds": round(elapsed, 3),
+            "requests": self.requests,
+            "functions": functions,
+        }
+        path = self.hass.config.path(
+            f"gemini_super_agent_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        try:
+            await self.hass.async_add_executor_job(self._write, path)
+            self.summary["path"] = path
+        except OSError as e:
+            _LOGGER.error(f"Error writing profile summary: {str(e)}")
+        
+        _LOGGER.info(f"Profiling finished after {self.requests} requests in {elapsed:.1f}s")
+        self.on_done(self)
+
+    def _deterministic_top(self) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            if not filename.startswith(PACKAGE_DIR):
+                continue
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": calls,
+                "own_seconds": round(own, 4),
+                "cumulative_seconds": round(cumulative, 4),
+            })
+        rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+        return rows[:PROFILE_TOP_FUNCTIONS]
+
+    def _sample(self, thread_id: int) -> None:
+        """Record which package functions are on the loop thread's stack."""
+        while not self._stop_sampling.wait(PROFILE_SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(thread_id)
+            self._samples += 1
+            seen = set()
+            top = True
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename.startswith(PACKAGE_DIR):
+                    key = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+                    if top:
+                        self._own[key] += 1
+                    # Recursive frames count once per sample
+                    if key not in seen:
+                        seen.add(key)
+                        self._cumulative[key] += 1
+                top = False
+                frame = frame.f_back
+
+    def _sampling_top(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "function": key,
+                "samples": count,
+                "own_seconds": round(self._own[key] * PROFILE_SAMPLE_INTERVAL, 4),
+                "cumulative_seconds": round(count * PROFILE_SAMPLE_INTERVAL, 4),
+            }
+            for key, count in self._cumulative.most_common(PROFILE_TOP_FUNCTIONS)
+        ]
+
+    def _write(self, path: str) -> None:
+        lines = [
+            f"Gemini Super Agent profile ({self.summary['mode']})",
+            f"Finished: {self.summary['finished']}",
+            f"Duration: {self.summary['seconds']}s, requests: {self.summary['requests']}",
+            "",
+            f"{'cumulative s':>12} {'own s':>10}  function",
+        ]
+        for row in self.summary["functions"]:
+            lines.append(
+                f"{row['cumulative_seconds']:>12.4f} {row['own_seconds']:>10.4f}  {row['function']}"
+            )
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
@@ -0,0 +1,69 @@
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from .const import MAX_RESULT_CHARS, MAX_VALUE_CHARS
+
+def compact_value(value: Any, max_chars: int = MAX_VALUE_CHARS) -> Any:
+    """Return a JSON-safe version of a value, truncating large ones."""
+    text = json.dumps(value, default=str)
+    if len(text) > max_chars:
+        return text[:max_chars] + "..."
+    return json.loads(text)
+
+def _query_hash(query: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(query, sort_keys=True, default=str).encode()).hexdigest()[:8]
+
+def encode_cursor(offset: int, query: Dict[str, Any]) -> str:
+    """Build an opaque continuation token for the next page of a query."""
+    raw = f"{offset}:{_query_hash(query)}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str], query: Dict[str, Any]) -> int:
+    """Return the offset stored in a continuation token.
+
+    Raises ValueError if the token is malformed or belongs to another query.
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset, query_hash = base64.urlsafe_b64decode(padded).decode().split(":")
+        offset = int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if query_hash != _query_hash(query) or offset < 0:
+        raise ValueError("Cursor does not match this query")
+    return offset
+
+def paginate(
+    items: List[Any],
+    key: str,
+    query: Dict[str, Any],
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    max_chars: int = MAX_RESULT_CHARS
+) -> Dict[str, Any]:
+    """Return one page of items under both an item and a size cap.
+
+    The result holds the page under `key`, the total number of items and a
+    `next_cursor` to pass back for the following page when there is one.
+    """
+    try:
+        offset = decode_cursor(cursor, query)
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    page = []
+    size = 0
+    for item in items[offset:offset + max(1, limit)]:
+        size += len(json.dumps(item, default=str)) + 1
+        if page and size > max_chars:
+            break
+        page.append(item)
+    
+    result = {"total": len(items), key: page}
+    next_offset = offset + len(page)
+    if next_offset < len(items):
+        result["next_cursor"] = encode_cursor(next_offset, query)
+    return result
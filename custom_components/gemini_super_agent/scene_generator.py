@@ -36,10 +36,14 @@ async def generate_scene(
             scene_config
         )
         
-        # Fire event
         hass.bus.async_fire(
             EVENT_SCENE_CREATED,
-            {"name": name, "config": scene_config}
+            {
+                "name": name,
+                "scene_id": scene_config["scene_id"],
+                "content_hash": agent.artifacts.put(scene_config),
+                "entity_count": len(scene_config["entities"]),
+            }
         )
         
         return f"Scene '{name}' created successfully with {len(entities)} entities."
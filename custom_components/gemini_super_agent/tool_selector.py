@@ -0,0 +1,85 @@
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+from .function_handlers import FUNCTION_SCHEMAS
+
+# Intent keywords for each tool, matched on word boundaries
+TOOL_KEYWORDS = {
+    "create_automation": [
+        "automation", "automate", "automatically", "whenever", "every day",
+        "every night", "schedule", "sunset", "sunrise", "trigger",
+    ],
+    "analyze_logs": ["log", "logs", "error", "errors", "warning", "warnings", "failing", "not working"],
+    "check_configuration": ["configuration", "config", "yaml", "misconfigured"],
+    "find_entities": ["find", "which", "list", "show", "where", "entities", "devices"],
+    "get_entity_state": [
+        "state", "status", "is the", "are the", "temperature", "humidity",
+        "battery", "locked", "open", "closed", "on or off",
+    ],
+    "get_states": [
+        "which", "all the", "every", "how many", "how bright", "brightness",
+        "upstairs", "downstairs", "are on", "are off", "are open",
+    ],
+    "get_history": [
+        "history", "yesterday", "last night", "this week", "last week", "today",
+        "how long", "how often", "average", "coldest", "hottest", "how cold",
+        "how warm", "minimum", "maximum", "trend",
+    ],
+    "get_camera_snapshots": [
+        "camera", "cameras", "see", "look", "looks", "snapshot", "picture",
+        "image", "doorbell", "who is at", "what's at", "driveway", "porch",
+    ],
+    "control_entity": [
+        "turn on", "turn off", "switch on", "switch off", "toggle", "set",
+        "dim", "brighten", "lock", "unlock", "open", "close", "volume",
+    ],
+    "create_group": ["group"],
+    "generate_scene": ["scene", "mood", "ambiance", "atmosphere"],
+}
+
+# Tools that change Home Assistant
+ACTION_TOOLS = {"create_automation", "control_entity", "create_group", "generate_scene"}
+
+# Imperative phrasing at the start of a sentence or clause; together with an
+# action tool it forces a function call. Keywords alone ("when is sunset?")
+# only select tools.
+ACTION_PATTERN = re.compile(
+    r"(?:^|[.!?;,]\s*|\b(?:please|can you|could you|would you|and|then)\s+)"
+    r"(?:turn (?:on|off)|switch (?:on|off)|toggle|lock|unlock|dim|brighten|open|close"
+    r"|set\b.*\bto\b|create|make|add|generate|activate|schedule|automate)\b"
+)
+
+# Always offered: requests like "kitchen lights off please" name no tool,
+# and these schemas are small
+BASE_TOOLS = ["find_entities", "get_entity_state", "control_entity"]
+
+ENTITY_ID_PATTERN = re.compile(r"\b[a-z_]+\.[a-z0-9_]+\b")
+
+_KEYWORD_PATTERNS = {
+    name: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b")
+    for name, keywords in TOOL_KEYWORDS.items()
+}
+
+def select_tools(
+    user_input: str,
+    recent_tools: Iterable[str] = (),
+    schemas: List[Dict[str, Any]] = FUNCTION_SCHEMAS
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Pick the function schemas and calling mode for a request.
+
+    Returns the subset of schemas (in their original order) and the
+    function calling mode: ANY when the request is phrased as an action,
+    AUTO otherwise so plain questions are answered without a tool call.
+    """
+    text = user_input.lower()
+    selected = {name for name, pattern in _KEYWORD_PATTERNS.items() if pattern.search(text)}
+    
+    if ENTITY_ID_PATTERN.search(text):
+        selected.update(("get_entity_state", "control_entity"))
+    
+    mode = "ANY" if selected & ACTION_TOOLS and ACTION_PATTERN.search(text) else "AUTO"
+    
+    # Follow-ups ("and the bedroom too") reuse the conversation's recent tools
+    selected.update(recent_tools)
+    selected.update(BASE_TOOLS)
+    
+    return [schema for schema in schemas if schema["name"] in selected], mode
@@ -0,0 +1,152 @@
+import asyncio
+import io
+import logging
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from homeassistant.core import HomeAssistant
+from .const import (
+    DEFAULT_VISION_MAX_BYTES, DEFAULT_VISION_MAX_PIXELS, MAX_SNAPSHOT_CAMERAS,
+    SNAPSHOT_CACHE_TTL
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Images to attach to the function responses of the running request
+ATTACHMENTS: ContextVar[Optional[List["Frame"]]] = ContextVar("attachments", default=None)
+
+JPEG_QUALITIES = (85, 75, 60, 45)
+
+@dataclass
+class Frame:
+    entity_id: str
+    data: bytes
+    width: int
+    height: int
+    captured: float
+    mime_type: str = "image/jpeg"
+
+def downscale(content: bytes, max_pixels: int, max_bytes: int) -> Tuple[bytes, int, int]:
+    """Shrink and re-encode an image to JPEG within a pixel and byte budget.
+
+    Blocking; run in the executor.
+    """
+    from PIL import Image
+    
+    image = Image.open(io.BytesIO(content))
+    image = image.convert("RGB")
+    width, height = image.size
+    if width * height > max_pixels:
+        scale = math.sqrt(max_pixels / (width * height))
+        image = image.resize(
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            Image.LANCZOS,
+        )
+    
+    while True:
+        for quality in JPEG_QUALITIES:
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+            if buffer.tell() <= max_bytes:
+                return buffer.getvalue(), image.width, image.height
+        # Lowest quality is still too large; give up some resolution
+        if image.width <= 64 or image.height <= 64:
+            return buffer.getvalue(), image.width, image.height
+        image = image.resize(
+            (int(image.width * 0.75), int(image.height * 0.75)),
+            Image.LANCZOS,
+        )
+
+async def _async_fetch_camera_image(hass: HomeAssistant, entity_id: str) -> bytes:
+    from homeassistant.components.camera import async_get_image
+    image = await async_get_image(hass, entity_id)
+    return image.content
+
+class FrameCache:
+    """Recent downscaled snapshots per camera, so follow-ups reuse them.
+
+    `fetch` returns the raw image bytes for a camera and can be replaced by
+    a local stand-in; concurrent requests for the same camera share one
+    fetch.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_pixels: int = DEFAULT_VISION_MAX_PIXELS,
+        max_bytes: int = DEFAULT_VISION_MAX_BYTES,
+        ttl: float = SNAPSHOT_CACHE_TTL,
+        fetch: Callable[[HomeAssistant, str], Awaitable[bytes]] = _async_fetch_camera_image
+    ):
+        self.hass = hass
+        self.max_pixels = max_pixels
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.fetch = fetch
+        self._frames: Dict[str, Frame] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def async_get(self, entity_id: str) -> Tuple[Frame, bool]:
+        """Return a frame for a camera and whether it came from the cache."""
+        frame = self._frames.get(entity_id)
+        if frame and time.monotonic() - frame.captured < self.ttl:
+            return frame, True
+        
+        pending = self._pending.get(entity_id)
+        if pending is None:
+            pending = self.hass.async_create_task(self._async_capture(entity_id))
+            self._pending[entity_id] = pending
+        return await asyncio.shield(pending), False
+
+    async def _async_capture(self, entity_id: str) -> Frame:
+        try:
+            content = await self.fetch(self.hass, entity_id)
+            data, width, height = await self.hass.async_add_executor_job(
+                downscale, content, self.max_pixels, self.max_bytes
+            )
+        finally:
+            self._pending.pop(entity_id, None)
+        frame = Frame(entity_id, data, width, height, time.monotonic())
+        self._frames[entity_id] = frame
+        return frame
+
+    def clear(self) -> None:
+        self._frames.clear()
+
+async def get_camera_snapshots(agent: Any, entity_ids: List[str]) -> Dict[str, Any]:
+    """Attach downscaled snapshots of cameras to the response."""
+    entity_ids = [e for e in entity_ids if e.startswith("camera.")][:MAX_SNAPSHOT_CAMERAS]
+    if not entity_ids:
+        return {"error": "No camera entities given."}
+    
+    # Fetch all cameras at once
+    results = await asyncio.gather(
+        *(agent.frame_cache.async_get(entity_id) for entity_id in entity_ids),
+        return_exceptions=True,
+    )
+    
+    attachments = ATTACHMENTS.get()
+    snapshots = []
+    for entity_id, result in zip(entity_ids, results):
+        if isinstance(result, Exception):
+            _LOGGER.error(f"Error getting snapshot of {entity_id}: {str(result)}")
+            snapshots.append({"entity_id": entity_id, "error": str(result)})
+            continue
+        frame, cached = result
+        if attachments is not None:
+            attachments.append(frame)
+        snapshots.append({
+            "entity_id": entity_id,
+            "width": frame.width,
+            "height": frame.height,
+            "bytes": len(frame.data),
+            "age_seconds": round(time.monotonic() - frame.captured, 1),
+            "cached": cached,
+        })
+    
+    return {
+        "snapshots": snapshots,
+        "note": "The images follow this response, in the same order.",
+    }
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from .const import DOMAIN, WS_TYPE_ARTIFACT, WS_TYPE_PROCESS
+
+_LOGGER = logging.getLogger(__name__)
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_process)
+    websocket_api.async_register_command(hass, websocket_artifact)
+
+def _get_agent(hass: HomeAssistant, entry_id: Optional[str]) -> Any:
+    agents = hass.data.get(DOMAIN, {})
+    if entry_id:
+        return agents.get(entry_id)
+    return next(iter(agents.values()), None)
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_PROCESS,
+        vol.Required("text"): str,
+        vol.Optional("conversation_id", default="default"): str,
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_process(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Run a request and reply to the caller only.
+
+    The command works as a subscription: it is acknowledged right away, then
+    `chunk` events carry streamed text and a final `done`, `error` or
+    `cancelled` event ends it. Closing the socket, unsubscribing or sending a
+    new message in the same conversation cancels the request.
+    """
+    agent = _get_agent(hass, msg.get("entry_id"))
+    if agent is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Gemini Super Agent is not set up")
+        return
+    
+    msg_id = msg["id"]
+    conversation_id = msg["conversation_id"]
+    
+    # A new message supersedes the one still running in this conversation
+    previous = agent.active_requests.pop(conversation_id, None)
+    if previous:
+        previous.cancel()
+    
+    @callback
+    def send_event(data: Dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg_id, data))
+    
+    async def run() -> None:
+        try:
+            # Let the superseded request restore the chat history first
+            if previous:
+                await asyncio.wait([previous])
+            response = await agent.process_request(
+                msg["text"],
+                conversation_id,
+                on_chunk=lambda text: send_event({"type": "chunk", "text": text}),
+            )
+        except asyncio.CancelledError:
+            send_event({"type": "cancelled"})
+            raise
+        except Exception as e:
+            _LOGGER.error(f"Error processing websocket request: {str(e)}")
+            send_event({"type": "error", "message": str(e)})
+            return
+        finally:
+            if agent.active_requests.get(conversation_id) is task:
+                agent.active_requests.pop(conversation_id)
+        send_event({"type": "done", "response": response})
+    
+    task = hass.async_create_task(run())
+    agent.active_requests[conversation_id] = task
+    connection.subscriptions[msg_id] = task.cancel
+    connection.send_result(msg_id)
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_ARTIFACT,
+        vol.Required("content_hash"): str,
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_artifact(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: Dict[str, Any]
+) -> None:
+    """Return the full payload behind an event's content hash."""
+    agent = _get_agent(hass, msg.get("entry_id"))
+    payload = agent.artifacts.get(msg["content_hash"]) if agent else None
+    if payload is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown or expired content hash")
+        return
+    connection.send_result(msg["id"], {"content_hash": msg["content_hash"], "payload": payload})
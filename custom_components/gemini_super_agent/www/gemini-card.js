@@ -3,10 +3,12 @@ class GeminiCard extends HTMLElement {
     this._config = config;
     this._conversationId = config.conversation_id || "default";
     this._maxMessages = config.max_messages || 10;
-    this._messages = [];
   }
 
   connectedCallback() {
+    // Re-attaching the card keeps the conversation already on screen
+    if (this._conversationDiv) return;
+
     this.innerHTML = `
       <ha-card header="Gemini Super Agent">
         <div class="card-content">
@@ -31,52 +33,113 @@ class GeminiCard extends HTMLElement {
     this._userInput.addEventListener("keypress", (e) => {
       if (e.key === "Enter") this._sendMessage();
     });
-
-    // Listen for responses
-    this._hassConnection = new EventSource("/api/stream");
-    this._hassConnection.addEventListener("message", (event) => {
-      const data = JSON.parse(event.data);
-      if (data.event_type === "gemini_super_agent_response" && 
-          data.data.conversation_id === this._conversationId) {
-        this._addMessage("assistant", data.data.response);
-      }
-    });
   }
 
-  _sendMessage() {
+  // There is no disconnectedCallback: Home Assistant detaches cards on every
+  // view switch, and a reply that arrives meanwhile is rendered into the
+  // detached DOM that comes back on re-attach. The server cancels the request
+  // when the socket closes or a new message is sent.
+
+  async _sendMessage() {
     const text = this._userInput.value.trim();
-    if (!text) return;
+    if (!text || !this._hass) return;
 
     this._addMessage("user", text);
     this._userInput.value = "";
 
-    this._hass.callService("gemini_super_agent", "process_request", {
-      text: text,
-      conversation_id: this._conversationId
+    // The server cancels the previous request of this conversation as well
+    this._unsubscribe();
+    const pending = { node: null, text: "" };
+    this._pending = pending;
+
+    // Replies come back over the existing hass connection, to this card only
+    const unsub = this._hass.connection.subscribeMessage(
+      (event) => this._handleEvent(pending, event),
+      {
+        type: "gemini_super_agent/process",
+        text: text,
+        conversation_id: this._conversationId,
+      }
+    );
+    this._unsub = unsub;
+    unsub.catch((err) => {
+      this._finishMessage(pending, `Error: ${err.message || err}`);
     });
   }
 
+  _unsubscribe() {
+    if (this._unsub) {
+      this._unsub.then((unsub) => unsub()).catch(() => {});
+      this._unsub = null;
+    }
+  }
+
+  _handleEvent(pending, event) {
+    if (pending !== this._pending && event.type !== "cancelled") return;
+
+    switch (event.type) {
+      case "chunk":
+        // Streamed text is rendered in place in a single message node
+        pending.text += event.text;
+        if (!pending.node) {
+          pending.node = this._addMessage("assistant", "");
+        }
+        pending.node.firstElementChild.textContent = pending.text;
+        this._scrollToBottom();
+        break;
+      case "done":
+        this._finishMessage(pending, event.response);
+        break;
+      case "error":
+        this._finishMessage(pending, `Error: ${event.message}`);
+        break;
+      case "cancelled":
+        if (pending.node) pending.node.classList.add("cancelled");
+        break;
+    }
+  }
+
+  _finishMessage(pending, text) {
+    if (!pending.node) {
+      pending.node = this._addMessage("assistant", "");
+    }
+    pending.node.firstElementChild.innerHTML = this._formatMessage(text || "");
+    this._scrollToBottom();
+    if (pending === this._pending) {
+      this._pending = null;
+      this._unsubscribe();
+    }
+  }
+
   _addMessage(role, text) {
-    this._messages.push({ role, text });
-    if (this._messages.length > this._maxMessages) {
-      this._messages.shift();
+    const node = document.createElement("div");
+    node.className = `message ${role}`;
+    const content = document.createElement("div");
+    content.className = "message-content";
+    content.innerHTML = this._formatMessage(text);
+    node.appendChild(content);
+    this._conversationDiv.appendChild(node);
+
+    // Drop the oldest messages instead of re-rendering the conversation
+    while (this._conversationDiv.childElementCount > this._maxMessages) {
+      this._conversationDiv.firstElementChild.remove();
     }
 
-    this._updateConversation();
+    this._scrollToBottom();
+    return node;
   }
 
-  _updateConversation() {
-    this._conversationDiv.innerHTML = this._messages.map(msg => `
-      <div class="message ${msg.role}">
-        <div class="message-content">${this._formatMessage(msg.text)}</div>
-      </div>
-    `).join("");
+  _scrollToBottom() {
     this._conversationDiv.scrollTop = this._conversationDiv.scrollHeight;
   }
 
   _formatMessage(text) {
+    const escaped = text
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;");
     // Simple formatting for code blocks
-    return text.replace(/```([\s\S]*?)```/g, '<pre><code>$1</code></pre>');
+    return escaped.replace(/```([\s\S]*?)```/g, '<pre><code>$1</code></pre>');
   }
 
   get hass() {
@@ -88,4 +151,4 @@ class GeminiCard extends HTMLElement {
   }
 }
 
-customElements.define("gemini-card", GeminiCard);
\ No newline at end of file
+customElements.define("gemini-card", GeminiCard);
@@ -0,0 +1 @@
+"""Tests for the Gemini Super Agent integration."""
@@ -0,0 +1,85 @@
+"""Tests for the batch API client against a local stand-in."""
+import asyncio
+
+from custom_components.gemini_super_agent.batch import BatchApiClient
+
+BASE_URL = "http://stub.local/v1beta/"
+
+
+class _Response:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def json(self):
+        return self._payload
+
+    async def text(self):
+        return str(self._payload)
+
+
+class _Session:
+    """Answers the batch endpoints the way the Gemini API does."""
+
+    def __init__(self, polls_before_done=1, status=200):
+        self.polls_before_done = polls_before_done
+        self.status = status
+        self.requests = []
+        self.submitted = None
+
+    def request(self, method, url, headers=None, json=None):
+        self.requests.append((method, url))
+        if method == "post":
+            self.submitted = json
+            return _Response(self.status, {"name": "batches/123"})
+        if self.polls_before_done:
+            self.polls_before_done -= 1
+            return _Response(200, {"name": "batches/123"})
+        requests = self.submitted["batch"]["input_config"]["requests"]["requests"]
+        responses = [
+            {
+                "metadata": request["metadata"],
+                "response": {"candidates": [{"content": {"parts": [
+                    {"text": f"answer {request['metadata']['key']}"}
+                ]}}]},
+            }
+            for request in reversed(requests)
+        ]
+        responses[0] = {"metadata": responses[0]["metadata"], "error": {"message": "blocked"}}
+        return _Response(200, {
+            "name": "batches/123",
+            "done": True,
+            "response": {"inlinedResponses": {"inlinedResponses": responses}},
+        })
+
+
+def test_batch_job_is_submitted_polled_and_matched_by_key():
+    session = _Session()
+    client = BatchApiClient(session, "key", "gemini-pro", BASE_URL, poll_interval=0)
+
+    items = asyncio.run(client.async_run(["a", "b", "c"], "house", "states", timeout=10))
+
+    assert session.requests == [
+        ("post", "http://stub.local/v1beta/models/gemini-pro:batchGenerateContent"),
+        ("get", "http://stub.local/v1beta/batches/123"),
+        ("get", "http://stub.local/v1beta/batches/123"),
+    ]
+    assert [item["status"] for item in items] == ["ok", "ok", "error"]
+    assert items[0]["response"] == "answer 0"
+    assert items[2]["error"] == "blocked"
+
+
+def test_failed_submission_marks_every_item():
+    session = _Session(status=400)
+    client = BatchApiClient(session, "key", "gemini-pro", BASE_URL, poll_interval=0)
+
+    items = asyncio.run(client.async_run(["a", "b"], "house", "states", timeout=10))
+
+    assert [item["status"] for item in items] == ["error", "error"]
+    assert "400" in items[0]["error"]
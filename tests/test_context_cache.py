@@ -0,0 +1,219 @@
+"""Tests for the context cache manager with a local backend."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from custom_components.gemini_super_agent.context_cache import ContextCacheManager
+from custom_components.gemini_super_agent.gemini_agent import GeminiAgent
+
+
+class _Hass:
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+
+class _Backend:
+    """Stand-in for the caching endpoints that records every call."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def create(self, model_name, system_instruction, tools, tool_config, ttl):
+        self.calls.append(("create", model_name))
+        if self.fail:
+            raise ValueError("Cached content is too small")
+        return {"model": model_name, "instruction": system_instruction, "tool_config": tool_config}
+
+    def extend(self, cache, ttl):
+        self.calls.append(("extend", cache["model"]))
+
+    def delete(self, cache):
+        self.calls.append(("delete", cache["model"]))
+
+    def model_from_cache(self, cache):
+        return _CachedModel(cache)
+
+
+class _CachedModel:
+    """Rejects what the API rejects next to cached content."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __eq__(self, other):
+        return isinstance(other, _CachedModel) and self.cache == other.cache
+
+    def check_request(self, **kwargs):
+        if "tools" in kwargs or "tool_config" in kwargs:
+            raise ValueError("tools and tool_config must not be set with cached content")
+
+
+class _Chat:
+    def __init__(self):
+        self.model = None
+        self.sent = []
+
+    async def send_message_async(self, content, **kwargs):
+        check = getattr(self.model, "check_request", None)
+        if check:
+            check(**kwargs)
+        self.sent.append(kwargs)
+
+
+TOOLS = [{"name": "find_entities", "parameters": {}}]
+
+
+def test_cache_is_created_once_and_reused():
+    backend = _Backend()
+    manager = ContextCacheManager(_Hass(), backend=backend, ttl=3600)
+
+    async def run():
+        first = await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+        second = await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert first.cache["instruction"] == "house v1"
+    assert backend.calls == [("create", "gemini-pro")]
+    assert manager.stats["creates"] == 1
+    assert manager.stats["hits"] == 1
+
+
+def test_changed_prefix_replaces_the_cache():
+    backend = _Backend()
+    manager = ContextCacheManager(_Hass(), backend=backend, ttl=3600)
+
+    async def run():
+        await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+        return await manager.async_get_model("gemini-pro", "house v2", TOOLS, "AUTO")
+
+    model = asyncio.run(run())
+
+    assert model.cache["instruction"] == "house v2"
+    assert backend.calls == [
+        ("create", "gemini-pro"), ("delete", "gemini-pro"), ("create", "gemini-pro")
+    ]
+
+
+def test_cache_close_to_expiry_is_extended():
+    backend = _Backend()
+    manager = ContextCacheManager(_Hass(), backend=backend, ttl=3600)
+
+    async def run():
+        await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+        entry = manager._entries["gemini-pro:AUTO"]
+        entry.expires_at = time.monotonic() + manager.refresh_margin / 2
+        await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+
+    asyncio.run(run())
+
+    assert backend.calls == [("create", "gemini-pro"), ("extend", "gemini-pro")]
+
+
+def test_short_ttl_is_not_extended_on_every_request():
+    backend = _Backend()
+    manager = ContextCacheManager(_Hass(), backend=backend, ttl=60)
+
+    async def run():
+        for _ in range(3):
+            await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+
+    asyncio.run(run())
+
+    assert backend.calls == [("create", "gemini-pro")]
+
+
+def test_concurrent_misses_create_one_cache():
+    backend = _Backend()
+
+    class _SlowHass:
+        async def async_add_executor_job(self, target, *args):
+            await asyncio.sleep(0.01)
+            return target(*args)
+
+    manager = ContextCacheManager(_SlowHass(), backend=backend, ttl=3600)
+
+    async def run():
+        return await asyncio.gather(*(
+            manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+            for _ in range(4)
+        ))
+
+    models = asyncio.run(run())
+
+    assert backend.calls == [("create", "gemini-pro")]
+    assert all(model is models[0] for model in models)
+
+
+def test_uncacheable_prefix_is_not_retried():
+    backend = _Backend(fail=True)
+    manager = ContextCacheManager(_Hass(), backend=backend, ttl=3600)
+
+    async def run():
+        first = await manager.async_get_model("gemini-pro", "tiny", TOOLS, "AUTO")
+        second = await manager.async_get_model("gemini-pro", "tiny", TOOLS, "AUTO")
+        return first, second
+
+    assert asyncio.run(run()) == (None, None)
+    assert backend.calls == [("create", "gemini-pro")]
+    assert manager.stats["errors"] == 1
+
+
+def test_each_calling_mode_gets_its_own_cache():
+    backend = _Backend()
+    manager = ContextCacheManager(_Hass(), backend=backend, ttl=3600)
+
+    async def run():
+        auto = await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+        forced = await manager.async_get_model("gemini-pro", "house v1", TOOLS, "ANY")
+        again = await manager.async_get_model("gemini-pro", "house v1", TOOLS, "AUTO")
+        return auto, forced, again
+
+    auto, forced, again = asyncio.run(run())
+
+    assert auto.cache["tool_config"] == {"function_calling_config": "AUTO"}
+    assert forced.cache["tool_config"] == {"function_calling_config": "ANY"}
+    assert again is auto
+    assert backend.calls == [("create", "gemini-pro"), ("create", "gemini-pro")]
+
+
+def test_cached_requests_send_no_tools_or_tool_config():
+    agent = SimpleNamespace(
+        context_cache=ContextCacheManager(_Hass(), backend=_Backend(), ttl=3600),
+        system_instruction="house v1",
+        functions=TOOLS,
+        models={"gemini-pro": object()},
+    )
+    chat = _Chat()
+
+    async def run():
+        send_kwargs, cached = await GeminiAgent._async_prepare_model(
+            agent, chat, "gemini-pro", TOOLS, "ANY"
+        )
+        await chat.send_message_async("turn on the light", **send_kwargs)
+        return cached
+
+    assert asyncio.run(run())
+    assert isinstance(chat.model, _CachedModel)
+    assert chat.sent == [{}]
+
+
+def test_uncached_requests_send_tools_and_mode():
+    agent = SimpleNamespace(
+        context_cache=ContextCacheManager(_Hass(), backend=_Backend(fail=True), ttl=3600),
+        system_instruction="tiny",
+        functions=TOOLS,
+        models={"gemini-pro": object()},
+    )
+    chat = _Chat()
+
+    send_kwargs, cached = asyncio.run(
+        GeminiAgent._async_prepare_model(agent, chat, "gemini-pro", TOOLS, "AUTO")
+    )
+
+    assert not cached
+    assert chat.model is agent.models["gemini-pro"]
+    assert send_kwargs == {"tools": TOOLS, "tool_config": {"function_calling_config": "AUTO"}}
@@ -0,0 +1,118 @@
+"""Tests for the local fuzzy entity resolver."""
+import random
+import time
+
+from custom_components.gemini_super_agent.entity_resolver import EntityResolver
+
+WORDS = [
+    "living", "room", "kitchen", "bed", "bath", "light", "lamp", "sensor",
+    "temperature", "door", "window", "garage", "office", "hall", "porch",
+    "fan", "switch", "plug", "motion", "humidity",
+]
+
+
+def _filler(count):
+    """Return index entries that keep later updates on the incremental path."""
+    rng = random.Random(0)
+    return [
+        (f"sensor.filler_{i}", [" ".join(rng.choice(WORDS) for _ in range(3)) + f" {i}"])
+        for i in range(count)
+    ]
+
+
+def _ids(results):
+    return [entity_id for entity_id, _ in results]
+
+
+def test_search_tolerates_typos_and_word_order():
+    resolver = EntityResolver()
+    resolver.rebuild([
+        ("light.living_room", ["Living Room Light"]),
+        ("light.kitchen", ["Kitchen Lamp"]),
+        ("cover.garage", ["Garage Door"]),
+    ])
+
+    assert _ids(resolver.search("kitchn lamp"))[0] == "light.kitchen"
+    assert _ids(resolver.search("light living room"))[0] == "light.living_room"
+    assert resolver.search("zzzz") == []
+
+
+def test_incremental_update_replaces_names():
+    resolver = EntityResolver()
+    resolver.rebuild(_filler(200) + [("light.desk", ["Desk Lamp"])])
+    assert _ids(resolver.search("desk lamp", limit=1)) == ["light.desk"]
+
+    resolver.update("light.desk", ["Reading Light"])
+    resolver.update("light.lounge", ["Lounge Lamp"])
+
+    assert _ids(resolver.search("reading light", limit=1)) == ["light.desk"]
+    assert "light.desk" not in _ids(resolver.search("desk lamp"))
+    assert _ids(resolver.search("lounge lamp", limit=1)) == ["light.lounge"]
+    assert len(resolver) == 202
+
+
+def test_removed_entities_are_not_returned_and_rows_are_reused():
+    resolver = EntityResolver()
+    resolver.rebuild(_filler(200) + [("light.porch", ["Porch Light"])])
+    assert _ids(resolver.search("porch light", limit=1)) == ["light.porch"]
+
+    resolver.remove("light.porch")
+    assert "light.porch" not in _ids(resolver.search("porch light"))
+    assert len(resolver) == 200
+
+    # The next entity takes over the freed row
+    resolver.update("light.veranda", ["Veranda Light"])
+    assert _ids(resolver.search("veranda light", limit=1)) == ["light.veranda"]
+    assert "light.porch" not in _ids(resolver.search("porch light"))
+
+    # Removing an unknown entity is a no-op
+    resolver.remove("light.unknown")
+    assert len(resolver) == 201
+
+
+def test_many_changes_trigger_a_full_reweight():
+    resolver = EntityResolver()
+    resolver.rebuild(_filler(100))
+    assert not resolver.needs_reweight
+
+    resolver.update("sensor.new", ["attic thing"])
+    assert not resolver.needs_reweight
+
+    for i in range(50):
+        resolver.remove(f"sensor.filler_{i}")
+    for i in range(50):
+        resolver.update(f"sensor.new_{i}", [f"attic thing {i}"])
+    assert resolver.needs_reweight
+
+    assert _ids(resolver.search("attic thing 42", limit=1)) == ["sensor.new_42"]
+    assert not any(
+        entity_id.startswith("sensor.filler_") and int(entity_id.rsplit("_", 1)[1]) < 50
+        for entity_id in _ids(resolver.search("kitchen light", limit=25))
+    )
+
+
+def test_lookup_and_update_timings_on_a_large_index():
+    resolver = EntityResolver()
+    resolver.rebuild(_filler(12000))
+
+    # rebuild weighs the index, so even the first search is cheap
+    assert not resolver.needs_reweight
+    started = time.perf_counter()
+    resolver.search("kitchn temprature sensor")
+    assert time.perf_counter() - started < 0.05
+
+    started = time.perf_counter()
+    for _ in range(20):
+        resolver.search("kitchn temprature sensor")
+    lookup = (time.perf_counter() - started) / 20
+
+    started = time.perf_counter()
+    resolver.update("binary_sensor.new", ["Porch Motion"])
+    results = resolver.search("porch motion", limit=3)
+    update = time.perf_counter() - started
+
+    assert "binary_sensor.new" in _ids(results)
+    # Measured at about 5 ms per lookup and 10 ms per update; the bounds
+    # leave room for slow CI machines
+    assert lookup < 0.05
+    assert update < 0.1
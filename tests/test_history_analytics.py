@@ -0,0 +1,50 @@
+"""Tests for the vectorized history summaries."""
+import numpy as np
+
+from custom_components.gemini_super_agent.history_analytics import summarize_series
+
+
+def _series(*values):
+    return np.array(values, dtype=object)
+
+
+def test_numeric_series_is_time_weighted():
+    times = np.array([0.0, 100.0, 300.0])
+    summary = summarize_series(times, _series("10", "20", "40"), 0, 400, 4)
+
+    assert summary["min"] == 10
+    assert summary["max"] == 40
+    # 10 for 100 s, 20 for 200 s, 40 for 100 s
+    assert summary["mean"] == 22.5
+    assert summary["series"] == [10, 20, 20, 40]
+    assert summary["changes"] == 2
+    assert summary["last"] == "40"
+
+
+def test_gaps_are_left_out_of_the_statistics():
+    times = np.array([0.0, 100.0, 200.0, 300.0])
+    summary = summarize_series(
+        times, _series("20", "unavailable", "18.5", "22"), 0, 400, 4
+    )
+
+    assert summary["unavailable_seconds"] == 100
+    assert summary["min"] == 18.5
+    assert summary["mean"] == round((20 + 18.5 + 22) / 3, 2)
+    assert summary["series"][1] is None
+
+
+def test_text_series_reports_time_in_state():
+    times = np.array([0.0, 100.0, 300.0, 350.0])
+    summary = summarize_series(times, _series("on", "off", "on", "unknown"), 0, 400, 4)
+
+    assert summary["seconds_in_state"] == {"off": 200, "on": 150}
+    assert summary["unavailable_seconds"] == 50
+    assert summary["changes"] == 3
+    assert "mean" not in summary
+
+
+def test_series_without_values():
+    times = np.array([0.0])
+    summary = summarize_series(times, _series("unavailable"), 0, 60, 3)
+
+    assert summary == {"changes": 0, "last": "unavailable", "unavailable_seconds": 60}
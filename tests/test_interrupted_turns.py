@@ -0,0 +1,73 @@
+"""Tests for the chat history of failed and cancelled turns."""
+import asyncio
+from collections import OrderedDict, deque
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.gemini_super_agent.gemini_agent import INTERRUPTED_REPLY, GeminiAgent
+
+
+class _Chat:
+    """Chat whose second message, the function responses, fails."""
+
+    def __init__(self, error):
+        self.history = ["prompt", "function call"]
+        self.error = error
+
+    async def send_message_async(self, content, **kwargs):
+        raise self.error
+
+
+def _agent(calls):
+    async def control_entity(agent, entity_id, action):
+        calls.append((entity_id, action))
+        return {"entity_id": entity_id, "state": "on"}
+
+    agent = GeminiAgent.__new__(GeminiAgent)
+    agent.function_handlers = {"control_entity": control_entity}
+    agent.entities = {"light.porch": {}}
+    return agent
+
+
+def _response():
+    return SimpleNamespace(function_calls=[
+        SimpleNamespace(name="control_entity", args={"entity_id": "light.porch", "action": "turn_on"}),
+        SimpleNamespace(name="control_entity", args={"entity_id": "light.porch", "action": "turn_off"}),
+    ])
+
+
+@pytest.mark.parametrize("error", [asyncio.CancelledError(), ValueError("API error")])
+def test_calls_that_ran_stay_in_the_history(error):
+    calls = []
+    agent = _agent(calls)
+    chat = _Chat(error)
+    recent_tools = deque()
+    focus = OrderedDict()
+
+    with pytest.raises(type(error)):
+        asyncio.run(agent._async_run_functions(chat, _response(), recent_tools, focus, None))
+
+    assert calls == [("light.porch", "turn_on"), ("light.porch", "turn_off")]
+    assert chat.history[:2] == ["prompt", "function call"]
+    function_turn, reply_turn = chat.history[2:]
+    assert [part["function_response"]["response"]["state"] for part in function_turn["parts"]] == ["on", "on"]
+    assert reply_turn == {"role": "model", "parts": [{"text": INTERRUPTED_REPLY}]}
+    assert list(recent_tools) == ["control_entity", "control_entity"]
+    assert list(focus) == ["light.porch"]
+
+
+def test_calls_that_did_not_finish_are_answered_with_an_error():
+    agent = _agent([])
+    chat = _Chat(None)
+
+    agent._keep_interrupted_turn(
+        chat,
+        ["prompt", "function call"],
+        _response().function_calls,
+        [{"name": "control_entity", "response": {"state": "on"}}],
+    )
+
+    parts = chat.history[2]["parts"]
+    assert parts[0]["function_response"]["response"] == {"state": "on"}
+    assert "error" in parts[1]["function_response"]["response"]
@@ -0,0 +1,63 @@
+"""Tests for the size-capped, paginated tool results."""
+import pytest
+
+from custom_components.gemini_super_agent.result_utils import (
+    compact_value, decode_cursor, encode_cursor, paginate
+)
+
+QUERY = {"domain": "light", "area": None}
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(40, QUERY)
+
+    assert decode_cursor(cursor, QUERY) == 40
+    assert decode_cursor(None, QUERY) == 0
+
+
+def test_cursor_rejects_other_queries_and_garbage():
+    cursor = encode_cursor(40, QUERY)
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, {"domain": "switch", "area": None})
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", QUERY)
+
+
+def test_paginate_walks_every_item_once():
+    items = [f"light.lamp_{i}" for i in range(23)]
+    seen = []
+    cursor = None
+    while True:
+        page = paginate(items, "entities", QUERY, cursor, limit=10)
+        assert page["total"] == 23
+        seen.extend(page["entities"])
+        cursor = page.get("next_cursor")
+        if cursor is None:
+            break
+
+    assert seen == items
+
+
+def test_paginate_respects_the_size_cap():
+    items = ["x" * 100 for _ in range(10)]
+    page = paginate(items, "rows", QUERY, limit=10, max_chars=350)
+
+    assert len(page["rows"]) == 3
+    assert "next_cursor" in page
+
+    # A single oversized item is still returned so paging makes progress
+    page = paginate(["y" * 1000], "rows", QUERY, limit=10, max_chars=350)
+    assert page["rows"] == ["y" * 1000]
+    assert "next_cursor" not in page
+
+
+def test_paginate_reports_bad_cursor():
+    page = paginate(["a"], "rows", QUERY, cursor=encode_cursor(0, {"other": 1}))
+
+    assert "error" in page
+
+
+def test_compact_value_truncates_large_values():
+    assert compact_value({"a": 1}) == {"a": 1}
+    assert compact_value("z" * 500, max_chars=20).endswith("...")
@@ -0,0 +1,81 @@
+"""Tests for the per-turn entity state deltas."""
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from custom_components.gemini_super_agent.const import MAX_STATE_DELTA
+from custom_components.gemini_super_agent.gemini_agent import GeminiAgent
+
+
+class _States:
+    def __init__(self, states):
+        self.states = states
+
+    def get(self, entity_id):
+        state = self.states.get(entity_id)
+        return SimpleNamespace(state=state) if state is not None else None
+
+
+def _agent(states):
+    agent = GeminiAgent.__new__(GeminiAgent)
+    agent.hass = SimpleNamespace(states=_States(states))
+    agent.entities = {entity_id: {} for entity_id in states}
+    agent.state_snapshots = {}
+    agent.focus_entities = {}
+    return agent
+
+
+def _commit_turn(agent, conversation_id="default"):
+    text, snapshot = agent._build_state_context(conversation_id)
+    agent.state_snapshots[conversation_id] = snapshot
+    return text
+
+
+def test_first_turn_lists_every_state_and_later_turns_only_changes():
+    states = {"light.kitchen": "off", "sensor.power": "10"}
+    agent = _agent(states)
+
+    assert "light.kitchen: off" in _commit_turn(agent)
+    assert _commit_turn(agent) == "No entity state changes since the last turn."
+
+    states["light.kitchen"] = "on"
+    text = _commit_turn(agent)
+    assert "light.kitchen: off -> on" in text
+    assert "sensor.power" not in text
+
+
+def test_snapshot_only_advances_when_the_turn_is_kept():
+    states = {"light.kitchen": "off"}
+    agent = _agent(states)
+
+    # A turn that never reached the model leaves no snapshot behind
+    agent._build_state_context("default")
+    assert "Current entity states" in agent._build_state_context("default")[0]
+
+
+def test_entities_in_play_are_not_crowded_out_by_busy_sensors():
+    states = {f"sensor.power_{i:03}": "0" for i in range(MAX_STATE_DELTA + 50)}
+    states["light.zz_porch"] = "off"
+    agent = _agent(states)
+    _commit_turn(agent)
+
+    for entity_id in states:
+        states[entity_id] = "1" if entity_id.startswith("sensor.") else "on"
+    focus = agent.focus_entities.setdefault("default", OrderedDict())
+    agent._note_entities(focus, "Did light.zz_porch turn on?")
+
+    lines = _commit_turn(agent).splitlines()
+    assert lines[1] == "- light.zz_porch: off -> on"
+    assert lines[-1] == "- ... and 51 more"
+
+    # Changes left out are reported on the next turn
+    assert "sensor.power_149" in _commit_turn(agent)
+
+
+def test_entities_are_noted_from_arguments_and_results():
+    agent = _agent({"light.desk": "on", "switch.fan": "off", "sensor.other": "1"})
+    focus = OrderedDict()
+
+    agent._note_entities(focus, {"entity_ids": ["light.desk"], "action": "turn_on"})
+    agent._note_entities(focus, {"rows": [["switch.fan", "off"]], "note": "light.unknown"})
+
+    assert list(focus) == ["light.desk", "switch.fan"]
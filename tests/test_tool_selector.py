@@ -0,0 +1,64 @@
+"""Tests for per-request tool selection."""
+import pytest
+
+from custom_components.gemini_super_agent.tool_selector import select_tools
+
+
+def _names(user_input, recent_tools=()):
+    tools, mode = select_tools(user_input, recent_tools)
+    return {tool["name"] for tool in tools}, mode
+
+
+@pytest.mark.parametrize("user_input", [
+    "Please open the garage",
+    "kitchen lights off please",
+    "lights off in the kitchen",
+    "I want the porch light on",
+    "make it cosy in here",
+])
+def test_action_requests_can_control_entities(user_input):
+    names, _ = _names(user_input)
+
+    assert {"find_entities", "get_entity_state", "control_entity"} <= names
+
+
+@pytest.mark.parametrize("user_input", [
+    "turn on the kitchen light",
+    "Please set the thermostat to 21",
+    "Can you dim the bedroom lights",
+    "It's late, turn off everything",
+    "create an automation that turns off the lights at sunset",
+])
+def test_imperative_actions_force_a_call(user_input):
+    _, mode = _names(user_input)
+
+    assert mode == "ANY"
+
+
+@pytest.mark.parametrize("user_input", [
+    "when is sunset today?",
+    "what schedule does the heating trigger on?",
+    "is the light set to 50%?",
+    "when did I turn off the tv?",
+    "how dim is the lamp?",
+    "kitchen lights off please",
+])
+def test_questions_and_loose_phrasing_use_auto(user_input):
+    _, mode = _names(user_input)
+
+    assert mode == "AUTO"
+
+
+def test_keywords_select_extra_tools():
+    names, _ = _names("what was the average temperature yesterday?")
+    assert "get_history" in names
+    assert "create_automation" not in names
+
+    names, _ = _names("create an automation for sunset")
+    assert "create_automation" in names
+
+
+def test_recent_tools_carry_over_to_follow_ups():
+    names, _ = _names("and the bedroom too", recent_tools=["generate_scene"])
+
+    assert "generate_scene" in names
@@ -0,0 +1,89 @@
+"""Tests for camera snapshot downscaling and caching."""
+import asyncio
+import io
+import os
+
+from PIL import Image
+
+from custom_components.gemini_super_agent.vision import FrameCache, downscale
+
+
+def _png(width, height):
+    buffer = io.BytesIO()
+    # Noise does not compress, so the byte budget is actually exercised
+    Image.frombytes("RGB", (width, height), os.urandom(width * height * 3)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class _Hass:
+    """The parts of HomeAssistant that FrameCache uses."""
+
+    def async_create_task(self, coro):
+        return asyncio.ensure_future(coro)
+
+    async def async_add_executor_job(self, target, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+def test_downscale_stays_within_both_budgets():
+    data, width, height = downscale(_png(1920, 1080), 640 * 480, 150000)
+
+    assert width * height <= 640 * 480
+    assert len(data) <= 150000
+    assert abs(width / height - 1920 / 1080) < 0.01
+    assert Image.open(io.BytesIO(data)).format == "JPEG"
+
+
+def test_downscale_keeps_small_images():
+    data, width, height = downscale(_png(320, 240), 640 * 480, 1000000)
+
+    assert (width, height) == (320, 240)
+
+
+def test_downscale_gives_up_resolution_for_a_tight_byte_budget():
+    data, width, height = downscale(_png(640, 480), 640 * 480, 15000)
+
+    assert len(data) <= 15000
+    assert width < 640
+
+
+def test_frame_cache_shares_fetches_and_reuses_frames():
+    calls = []
+    raw = _png(800, 600)
+
+    async def fetch(hass, entity_id):
+        calls.append(entity_id)
+        await asyncio.sleep(0.01)
+        return raw
+
+    async def run():
+        cache = FrameCache(_Hass(), max_pixels=320 * 240, fetch=fetch)
+        first, second = await asyncio.gather(
+            cache.async_get("camera.front"), cache.async_get("camera.front")
+        )
+        third = await cache.async_get("camera.front")
+        return first, second, third
+
+    (frame, cached), (shared, shared_cached), (again, again_cached) = asyncio.run(run())
+
+    assert calls == ["camera.front"]
+    assert frame is shared is again
+    assert not cached and not shared_cached and again_cached
+    assert frame.width * frame.height <= 320 * 240
+
+
+def test_frame_cache_refetches_after_ttl():
+    calls = []
+
+    async def fetch(hass, entity_id):
+        calls.append(entity_id)
+        return _png(64, 64)
+
+    async def run():
+        cache = FrameCache(_Hass(), ttl=0, fetch=fetch)
+        await cache.async_get("camera.back")
+        await cache.async_get("camera.back")
+
+    asyncio.run(run())
+
+    assert calls == ["camera.back", "camera.back"]